@@ -1,15 +1,53 @@
 import streamlit as st
+import contextlib
+import hashlib
 import os
+import queue
 import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 from utils.audio_processor import AudioProcessor
-from utils.transcription import TranscriptionService
-from utils.ai_analysis import AIAnalysisService
-from utils.storage import StorageService
+from utils.transcription import TranscriptionService, RemoteTranscriptionService, DEFAULT_WHISPER_SERVER_MODEL
+from utils.ai_analysis import AIAnalysisService, OLLAMA_MODEL_TAGS, DEFAULT_OLLAMA_QUANTIZATION, FALLBACK_PROVIDER
+from utils.storage import StorageService, LISTING_FIELDS
 from utils.export import ExportService
-from utils.audio_recorder import AudioRecorder, get_recording_instructions
+from utils import serialization
+
+SEARCH_PAGE_SIZE = 20  # Search hits rendered per page
+EXPORT_CACHE_ENTRIES = 64  # Built exports kept per session; each holds a full transcript
+TRANSCRIPT_CACHE_ENTRIES = 8  # Uploaded files whose transcripts are kept per session
+ANALYSIS_CACHE_ENTRIES = 16  # AI analyses kept per session, keyed by transcript and model
+TRANSCRIPT_PREVIEW_CHARS = 5000  # Transcript text sent to the browser until "Show full" is clicked
+BACKGROUND_START_TIMEOUT = 60  # Seconds a queued transcription job may wait for a free worker
+LIVE_TRANSCRIPTION_MAX_SECONDS = 4 * 60 * 60  # Live loops end after this, e.g. if the tab closed mid-recording
+
+# Every provider the selector offers, keyed by value, in display order
+PROVIDER_OPTIONS = {
+    'openai': {
+        'name': 'OpenAI (Cloud) ☁️',
+        'description': 'High-quality analysis via OpenAI API',
+        'privacy': 'Transcript sent to OpenAI'
+    },
+    'ollama': {
+        'name': 'Local Gemma (Ollama) 🏠',
+        'description': 'Fully private local processing',
+        'privacy': 'Data never leaves your device'
+    },
+    'lm_studio': {
+        'name': 'LM Studio (Local Server) 🖥️',
+        'description': 'OpenAI-compatible local server',
+        'privacy': 'Data processed on local LM Studio server'
+    },
+    'fallback': {
+        'name': 'Basic Analysis (No AI) 🔧',
+        'description': 'Simple keyword-based analysis',
+        'privacy': 'Fully local'
+    }
+}
+PROVIDER_VALUES = tuple(PROVIDER_OPTIONS)
 
 # Page configuration
 st.set_page_config(
@@ -29,6 +67,23 @@ def get_services():
         'export': ExportService()
     }
 
+@st.cache_resource
+def get_background_executor():
+    """Thread pool shared by all sessions for short fire-and-forget work that must not call st.* (e.g. warmups)"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="privanote")
+
+@st.cache_resource
+def get_transcription_executor():
+    """Thread pool shared by all sessions for transcription jobs a script run waits on"""
+    # Separate from the warmup pool, so slow jobs and quick warmups never queue behind each other
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="privanote-transcribe")
+
+def raise_if_not_started(future, queued_at):
+    """Cancel and fail a job that is still waiting for a worker after BACKGROUND_START_TIMEOUT"""
+    if not future.running() and not future.done() and time.monotonic() - queued_at > BACKGROUND_START_TIMEOUT:
+        future.cancel()
+        raise Exception("All transcription workers are busy with other sessions; please try again shortly")
+
 # Initialize cached services
 services = get_services()
 
@@ -39,10 +94,56 @@ if 'ai_model' not in st.session_state:
     st.session_state.ai_model = 'gpt-4o'
 if 'lm_studio_config' not in st.session_state:
     st.session_state.lm_studio_config = {'host': 'localhost', 'port': 1234, 'model': 'google/gemma-3n-e4b'}
+if 'ollama_quantization' not in st.session_state:
+    st.session_state.ollama_quantization = DEFAULT_OLLAMA_QUANTIZATION
+if 'use_whisper_server' not in st.session_state:
+    st.session_state.use_whisper_server = False
+if 'whisper_server_config' not in st.session_state:
+    st.session_state.whisper_server_config = {'host': 'localhost', 'port': 8000, 'model': DEFAULT_WHISPER_SERVER_MODEL}
+
+@st.cache_resource(show_spinner=False)
+def get_remote_transcription(server_config):
+    """Create one Whisper server client per configuration"""
+    return RemoteTranscriptionService(server_config)
+
+@st.cache_resource(show_spinner=False)
+def get_ai_service(provider, model_name, lm_studio_config):
+    """Create one AI service per provider configuration, reused across reruns and sessions
+    
+    Only the clients are cached here; local server reachability is probed through
+    get_available_providers, which expires every 15 seconds.
+    """
+    return AIAnalysisService(
+        provider=provider,
+        model_name=model_name,
+        lm_studio_config=lm_studio_config
+    )
+
+@st.cache_data(ttl=15, show_spinner=False)
+def get_available_providers(provider, model_name, lm_studio_config):
+    """List reachable providers, probing Ollama/LM Studio at most every 15 seconds"""
+    # The service is cached for the process, so its flags only change when re-probed here
+    service = get_ai_service(provider, model_name, lm_studio_config)
+    service.refresh_availability()
+    return service.get_available_providers()
+
+def current_ai_service():
+    """Get the AI service for this session's provider settings, with reachability at most 15 seconds old"""
+    provider = st.session_state.ai_provider
+    args = (provider, get_provider_model(provider), st.session_state.lm_studio_config)
+    # Same cache entry as the sidebar's provider list, so this is usually a cache hit
+    get_available_providers(*args)
+    return get_ai_service(*args)
+
+def get_provider_model(provider):
+    """Get the model name configured for a provider"""
+    if provider == 'ollama':
+        return OLLAMA_MODEL_TAGS[st.session_state.ollama_quantization]
+    if provider == 'lm_studio':
+        return st.session_state.lm_studio_config['model']
+    return st.session_state.ai_model
 
 # Initialize session state
-if 'meetings' not in st.session_state:
-    st.session_state.meetings = []
 if 'current_meeting' not in st.session_state:
     st.session_state.current_meeting = None
 if 'audio_recorder' not in st.session_state:
@@ -50,6 +151,232 @@ if 'audio_recorder' not in st.session_state:
 if 'recording_file' not in st.session_state:
     st.session_state.recording_file = None
 
+@st.fragment
+def sidebar_settings():
+    """AI provider, transcription and stats controls; reruns on its own without the main tab"""
+    # AI Provider Selection
+    st.markdown("### AI Configuration")
+    
+    # Get available providers
+    provider = st.session_state.ai_provider
+    available_providers = get_available_providers(
+        provider, get_provider_model(provider), st.session_state.lm_studio_config
+    )
+    
+    # Providers that answered the probe; basic analysis needs no setup
+    available_values = {p['value'] for p in available_providers}
+    available_values.add('fallback')
+    
+    # Provider selector (always visible)
+    current_value = st.session_state.ai_provider
+    selected_value = st.selectbox(
+        "AI Provider",
+        options=PROVIDER_VALUES,
+        index=PROVIDER_VALUES.index(current_value) if current_value in PROVIDER_OPTIONS else 0,
+        format_func=lambda value: (
+            PROVIDER_OPTIONS[value]['name'] if value in available_values
+            else f"{PROVIDER_OPTIONS[value]['name']} (Setup Required)"
+        ),
+        help="Choose your preferred AI processing method"
+    )
+    # Clearing the cache makes the next lookup probe Ollama and LM Studio again
+    st.button(
+        "🔄 Refresh Providers",
+        on_click=get_available_providers.clear,
+        help="Check again for Ollama and LM Studio without waiting for the 15 second refresh"
+    )
+    
+    selected_option = PROVIDER_OPTIONS[selected_value]
+    selected_available = selected_value in available_values
+    
+    # Handle provider selection
+    if selected_available and selected_value != st.session_state.ai_provider:
+        st.session_state.ai_provider = selected_value
+        st.rerun(scope="fragment")
+    
+    # Show provider info and setup instructions
+    if selected_available:
+        st.success(
+            f"✅ **{selected_option['name'].split(' (')[0]}** - Ready\n\n"
+            f"{selected_option['description']}\n\n"
+            f"🔒 Privacy: {selected_option['privacy']}"
+        )
+        
+        if selected_value == 'ollama':
+            quantizations = list(OLLAMA_MODEL_TAGS)
+            quantization = st.selectbox(
+                "Quantization",
+                options=quantizations,
+                index=quantizations.index(st.session_state.ollama_quantization),
+                help="Lower precision runs faster and uses less memory; pull the matching tag first"
+            )
+            if quantization != st.session_state.ollama_quantization:
+                st.session_state.ollama_quantization = quantization
+                st.rerun(scope="fragment")
+    elif selected_value == 'openai':
+        st.warning(
+            f"⚠️ **OpenAI (Cloud)** - Setup Required\n\n"
+            f"{selected_option['description']}\n\n"
+            f"🔒 Privacy: {selected_option['privacy']}\n\n"
+            f"**Setup:** Add OpenAI API key in Replit Secrets"
+        )
+        if st.button("ℹ️ How to add OpenAI API Key", key="openai_help"):
+            st.info("""
+            **To enable OpenAI analysis:**
+            1. Go to Replit Secrets (in sidebar)
+            2. Add key: `OPENAI_API_KEY`
+            3. Add your OpenAI API key as value
+            4. Restart the app
+            """)
+    elif selected_value == 'ollama':
+        st.info(
+            f"🏠 **Local Gemma (Ollama)** - Setup Required\n\n"
+            f"{selected_option['description']}\n\n"
+            f"🔒 Privacy: {selected_option['privacy']}\n\n"
+            f"**Setup:** Install Ollama locally (see Privacy section)"
+        )
+        if st.button("🏠 How to setup Local Ollama", key="ollama_help"):
+            st.info("""
+            **For maximum privacy with local processing:**
+            1. Download this app's code
+            2. Install Ollama locally from ollama.com
+            3. Run: `ollama pull gemma3:4b-it-q4_K_M`
+            4. Run this app locally with `streamlit run app.py`
+            """)
+    elif selected_value == 'lm_studio':
+        st.warning(
+            f"⚠️ **LM Studio (Local Server)** - Setup Required\n\n"
+            f"{selected_option['description']}\n\n"
+            f"🔒 Privacy: {selected_option['privacy']}\n\n"
+            f"**Setup:** Configure and start LM Studio server"
+        )
+        
+        # LM Studio Configuration
+        st.markdown("**LM Studio Configuration:**")
+        col1, col2 = st.columns(2)
+        with col1:
+            lm_host = st.text_input(
+                "Host/IP Address", 
+                value=st.session_state.lm_studio_config['host'],
+                help="LM Studio server IP address (e.g., localhost, 172.28.0.1)"
+            )
+        with col2:
+            lm_port = st.number_input(
+                "Port", 
+                value=st.session_state.lm_studio_config['port'],
+                min_value=1000,
+                max_value=65535,
+                help="LM Studio server port (default: 1234)"
+            )
+        
+        lm_model = st.text_input(
+            "Model Name", 
+            value=st.session_state.lm_studio_config['model'],
+            help="LM Studio model name (e.g., google/gemma-3n-e4b)"
+        )
+        
+        # Update configuration
+        new_config = {'host': lm_host, 'port': lm_port, 'model': lm_model}
+        if new_config != st.session_state.lm_studio_config:
+            st.session_state.lm_studio_config = new_config
+            get_available_providers.clear()
+            st.rerun(scope="fragment")
+        
+        if st.button("🔄 Test Connection", key="lm_studio_test"):
+            with st.spinner("Testing LM Studio connection..."):
+                # Reuse the pooled client for this config; only the probe itself is repeated
+                lm_service = get_ai_service('lm_studio', lm_model, new_config)
+                connected = lm_service.refresh_lm_studio_availability()
+                get_available_providers.clear()
+                if connected:
+                    st.success(f"✅ Connected to LM Studio at {lm_host}:{lm_port}")
+                else:
+                    reason = f" ({lm_service.lm_studio_error})" if lm_service.lm_studio_error else ""
+                    st.error(f"❌ Cannot connect to LM Studio at {lm_host}:{lm_port}{reason}")
+        
+        if st.button("ℹ️ How to setup LM Studio", key="lm_studio_help"):
+            st.info("""
+            **LM Studio Setup Instructions:**
+            
+            1. **Download LM Studio:**
+               - Visit: https://lmstudio.ai
+               - Download and install for your platform
+            
+            2. **Load a Gemma model:**
+               - In LM Studio, go to "Discover" tab
+               - Search for "gemma" and download a model
+               - Recommended: google/gemma-3n-e4b or similar
+            
+            3. **Start Local Server:**
+               - Go to "Local Server" tab in LM Studio
+               - Select your downloaded model
+               - Click "Start Server" (default port: 1234)
+            
+            4. **Configure PrivaNote:**
+               - Set Host/IP (localhost for same machine)
+               - Set Port (default: 1234)
+               - Set Model Name (e.g., google/gemma-3n-e4b)
+               - Click "Test Connection"
+            """)
+    
+    
+    st.markdown("---")
+    st.markdown("### Transcription")
+    use_server = st.toggle(
+        "Use Whisper server on your network",
+        value=st.session_state.use_whisper_server,
+        help="Send audio to a self-hosted, OpenAI-compatible Whisper server (e.g. a GPU machine) instead of transcribing on this host"
+    )
+    if use_server != st.session_state.use_whisper_server:
+        st.session_state.use_whisper_server = use_server
+        st.rerun(scope="fragment")
+    
+    if use_server:
+        st.caption("🔒 Audio is uploaded to this server - only use one you control.")
+        server_config = st.session_state.whisper_server_config
+        col1, col2 = st.columns(2)
+        with col1:
+            server_host = st.text_input("Server Host", value=server_config['host'])
+        with col2:
+            server_port = st.number_input(
+                "Server Port",
+                value=server_config['port'],
+                min_value=1,
+                max_value=65535
+            )
+        server_model = st.text_input("Whisper Model", value=server_config['model'])
+        
+        new_server_config = {'host': server_host, 'port': server_port, 'model': server_model}
+        if new_server_config != server_config:
+            st.session_state.whisper_server_config = new_server_config
+            st.rerun(scope="fragment")
+        
+        if st.button("🔄 Test Server", key="whisper_server_test"):
+            with st.spinner("Testing Whisper server connection..."):
+                if get_remote_transcription(new_server_config).check_connection():
+                    st.success(f"✅ Connected to Whisper server at {server_host}:{server_port}")
+                else:
+                    st.error(f"❌ Cannot connect to Whisper server at {server_host}:{server_port}")
+    else:
+        model_info = services['transcription'].get_model_info()
+        if model_info['initialized']:
+            st.caption(
+                f"🏠 Local faster-whisper: {model_info['size']} on "
+                f"{model_info['device']} ({model_info['compute_type']})"
+            )
+        else:
+            st.caption(f"🏠 Local faster-whisper: {model_info['size']}, loads on first transcription")
+
+def quick_stats():
+    """Archive totals for the sidebar; rendered after the main tab so they include its changes"""
+    st.markdown("---")
+    st.markdown("### Quick Stats")
+    totals = services['storage'].get_totals()
+    st.metric("Total Meetings", totals['total_meetings'])
+    
+    if totals['total_meetings'] > 0:
+        st.metric("Total Audio Time", f"{totals['total_duration']:.1f} min")
+
 def main():
     # Header
     st.title("🔒 PrivaNote")
@@ -78,222 +405,9 @@ def main():
         
         st.markdown("---")
         
-        # AI Provider Selection
-        st.markdown("### AI Configuration")
-        
-        # Initialize AI service if not exists
-        if 'ai_service' not in st.session_state:
-            st.session_state.ai_service = AIAnalysisService(
-                provider=st.session_state.ai_provider,
-                model_name=st.session_state.ai_model,
-                lm_studio_config=st.session_state.lm_studio_config
-            )
-        
-        # Get available providers
-        available_providers = st.session_state.ai_service.get_available_providers()
-        
-        # Always show provider selector with all possible options
-        all_provider_options = [
-            {
-                'name': 'OpenAI (Cloud) ☁️',
-                'value': 'openai',
-                'available': any(p['value'] == 'openai' for p in available_providers),
-                'description': 'High-quality analysis via OpenAI API',
-                'privacy': 'Transcript sent to OpenAI'
-            },
-            {
-                'name': 'Local Gemma (Ollama) 🏠',
-                'value': 'ollama', 
-                'available': any(p['value'] == 'ollama' for p in available_providers),
-                'description': 'Fully private local processing',
-                'privacy': 'Data never leaves your device'
-            },
-            {
-                'name': 'LM Studio (Local Server) 🖥️',
-                'value': 'lm_studio',
-                'available': any(p['value'] == 'lm_studio' for p in available_providers),
-                'description': 'OpenAI-compatible local server',
-                'privacy': 'Data processed on local LM Studio server'
-            },
-            {
-                'name': 'Basic Analysis (No AI) 🔧',
-                'value': 'fallback',
-                'available': True,
-                'description': 'Simple keyword-based analysis',
-                'privacy': 'Fully local'
-            }
-        ]
-        
-        # Create display options with status indicators
-        provider_display_options = []
-        provider_value_map = {}
-        
-        for option in all_provider_options:
-            if option['available']:
-                display_name = option['name']
-            else:
-                display_name = f"{option['name']} (Setup Required)"
-                
-            provider_display_options.append(display_name)
-            provider_value_map[display_name] = option
-        
-        # Find current selection
-        current_option = next(
-            (opt for opt in all_provider_options if opt['value'] == st.session_state.ai_provider),
-            all_provider_options[0]
-        )
-        
-        current_display_name = next(
-            (name for name, opt in provider_value_map.items() if opt['value'] == current_option['value']),
-            provider_display_options[0]
-        )
-        
-        # Provider selector (always visible)
-        selected_display_name = st.selectbox(
-            "AI Provider",
-            options=provider_display_options,
-            index=provider_display_options.index(current_display_name),
-            help="Choose your preferred AI processing method"
-        )
-        
-        selected_option = provider_value_map[selected_display_name]
-        
-        # Handle provider selection
-        if selected_option['available'] and selected_option['value'] != st.session_state.ai_provider:
-            st.session_state.ai_provider = selected_option['value']
-            st.session_state.ai_service = AIAnalysisService(
-                provider=selected_option['value'],
-                model_name=st.session_state.ai_model,
-                lm_studio_config=st.session_state.lm_studio_config
-            )
-            st.rerun()
-        
-        # Show provider info and setup instructions
-        if selected_option['available']:
-            st.success(
-                f"✅ **{selected_option['name'].split(' (')[0]}** - Ready\n\n"
-                f"{selected_option['description']}\n\n"
-                f"🔒 Privacy: {selected_option['privacy']}"
-            )
-        elif selected_option['value'] == 'openai':
-            st.warning(
-                f"⚠️ **OpenAI (Cloud)** - Setup Required\n\n"
-                f"{selected_option['description']}\n\n"
-                f"🔒 Privacy: {selected_option['privacy']}\n\n"
-                f"**Setup:** Add OpenAI API key in Replit Secrets"
-            )
-            if st.button("ℹ️ How to add OpenAI API Key", key="openai_help"):
-                st.info("""
-                **To enable OpenAI analysis:**
-                1. Go to Replit Secrets (in sidebar)
-                2. Add key: `OPENAI_API_KEY`
-                3. Add your OpenAI API key as value
-                4. Restart the app
-                """)
-        elif selected_option['value'] == 'ollama':
-            st.info(
-                f"🏠 **Local Gemma (Ollama)** - Setup Required\n\n"
-                f"{selected_option['description']}\n\n"
-                f"🔒 Privacy: {selected_option['privacy']}\n\n"
-                f"**Setup:** Install Ollama locally (see Privacy section)"
-            )
-            if st.button("🏠 How to setup Local Ollama", key="ollama_help"):
-                st.info("""
-                **For maximum privacy with local processing:**
-                1. Download this app's code
-                2. Install Ollama locally from ollama.com
-                3. Run: `ollama pull gemma3`
-                4. Run this app locally with `streamlit run app.py`
-                """)
-        elif selected_option['value'] == 'lm_studio':
-            st.warning(
-                f"⚠️ **LM Studio (Local Server)** - Setup Required\n\n"
-                f"{selected_option['description']}\n\n"
-                f"🔒 Privacy: {selected_option['privacy']}\n\n"
-                f"**Setup:** Configure and start LM Studio server"
-            )
-            
-            # LM Studio Configuration
-            st.markdown("**LM Studio Configuration:**")
-            col1, col2 = st.columns(2)
-            with col1:
-                lm_host = st.text_input(
-                    "Host/IP Address", 
-                    value=st.session_state.lm_studio_config['host'],
-                    help="LM Studio server IP address (e.g., localhost, 172.28.0.1)"
-                )
-            with col2:
-                lm_port = st.number_input(
-                    "Port", 
-                    value=st.session_state.lm_studio_config['port'],
-                    min_value=1000,
-                    max_value=65535,
-                    help="LM Studio server port (default: 1234)"
-                )
-            
-            lm_model = st.text_input(
-                "Model Name", 
-                value=st.session_state.lm_studio_config['model'],
-                help="LM Studio model name (e.g., google/gemma-3n-e4b)"
-            )
-            
-            # Update configuration
-            new_config = {'host': lm_host, 'port': lm_port, 'model': lm_model}
-            if new_config != st.session_state.lm_studio_config:
-                st.session_state.lm_studio_config = new_config
-                st.session_state.ai_service = AIAnalysisService(
-                    provider=st.session_state.ai_provider,
-                    model_name=lm_model,
-                    lm_studio_config=new_config
-                )
-                st.rerun()
-            
-            if st.button("🔄 Test Connection", key="lm_studio_test"):
-                with st.spinner("Testing LM Studio connection..."):
-                    test_service = AIAnalysisService(
-                        provider='lm_studio',
-                        model_name=lm_model,
-                        lm_studio_config=new_config
-                    )
-                    if test_service.lm_studio_available:
-                        st.success(f"✅ Connected to LM Studio at {lm_host}:{lm_port}")
-                    else:
-                        st.error(f"❌ Cannot connect to LM Studio at {lm_host}:{lm_port}")
-            
-            if st.button("ℹ️ How to setup LM Studio", key="lm_studio_help"):
-                st.info("""
-                **LM Studio Setup Instructions:**
-                
-                1. **Download LM Studio:**
-                   - Visit: https://lmstudio.ai
-                   - Download and install for your platform
-                
-                2. **Load a Gemma model:**
-                   - In LM Studio, go to "Discover" tab
-                   - Search for "gemma" and download a model
-                   - Recommended: google/gemma-3n-e4b or similar
-                
-                3. **Start Local Server:**
-                   - Go to "Local Server" tab in LM Studio
-                   - Select your downloaded model
-                   - Click "Start Server" (default port: 1234)
-                
-                4. **Configure PrivaNote:**
-                   - Set Host/IP (localhost for same machine)
-                   - Set Port (default: 1234)
-                   - Set Model Name (e.g., google/gemma-3n-e4b)
-                   - Click "Test Connection"
-                """)
-        
-        
-        st.markdown("---")
-        st.markdown("### Quick Stats")
-        total_meetings = len(st.session_state.meetings)
-        st.metric("Total Meetings", total_meetings)
-        
-        if total_meetings > 0:
-            total_duration = sum([m.get('duration', 0) for m in st.session_state.meetings])
-            st.metric("Total Audio Time", f"{total_duration:.1f} min")
+        # Settings rerun as a fragment so changing them skips the main tab
+        sidebar_settings()
+        stats_slot = st.empty()
     
     # Main content area
     if tab == "📤 Upload & Analyze":
@@ -304,12 +418,17 @@ def main():
         meeting_archive_tab()
     else:
         search_meetings_tab()
+    
+    # Filled last so a meeting saved by the tab above is counted without a rerun
+    with stats_slot.container():
+        quick_stats()
 
 def live_recording_tab():
     st.header("🎙️ Live Audio Recording")
     
-    # Initialize audio recorder
+    # Initialize audio recorder; imported here so sounddevice/PortAudio only load for this tab
     if st.session_state.audio_recorder is None:
+        from utils.audio_recorder import AudioRecorder
         st.session_state.audio_recorder = AudioRecorder()
     
     recorder = st.session_state.audio_recorder
@@ -349,7 +468,9 @@ def microphone_recording_section(recorder):
         return
     
     # Device selection
-    devices = recorder.get_audio_devices()
+    devices = list_audio_devices(recorder)
+    # The list is cached for 30 seconds; a newly plugged-in microphone shouldn't have to wait
+    st.button("🔄 Refresh Devices", on_click=list_audio_devices.clear, help="Re-scan audio input devices")
     
     if not devices:
         st.error("❌ No audio input devices found. Please check your microphone connections.")
@@ -373,10 +494,7 @@ def microphone_recording_section(recorder):
     with col2:
         st.metric("Sample Rate", f"{selected_device['sample_rate']:.0f} Hz")
     with col3:
-        if recorder.is_recording():
-            st.metric("Duration", f"{recorder.get_recording_duration():.1f}s")
-        else:
-            st.metric("Status", "Ready")
+        st.metric("Status", "Recording" if recorder.is_recording() else "Ready")
     
     # Meeting metadata for recording
     col1, col2 = st.columns(2)
@@ -404,32 +522,22 @@ def microphone_recording_section(recorder):
     col1, col2, col3 = st.columns([1, 1, 2])
     
     with col1:
+        # Callbacks run before the rerun the click triggers, so that run already
+        # shows the other button without a second st.rerun()
         if not recorder.is_recording():
-            if st.button("🔴 Start Recording", type="primary", disabled=not meeting_title):
-                if recorder.start_recording(selected_device['index']):
-                    st.success("🎙️ Recording started!")
-                    st.rerun()
-                else:
-                    st.error("❌ Failed to start recording")
+            st.button(
+                "🔴 Start Recording",
+                type="primary",
+                disabled=not meeting_title,
+                on_click=start_recording,
+                args=(recorder, selected_device['index'])
+            )
         else:
-            if st.button("⏹️ Stop Recording", type="secondary"):
-                audio_file = recorder.stop_recording()
-                if audio_file:
-                    st.session_state.recording_file = audio_file
-                    st.success("✅ Recording stopped!")
-                    st.rerun()
-                else:
-                    st.error("❌ Failed to stop recording")
+            st.button("⏹️ Stop Recording", type="secondary", on_click=stop_recording, args=(recorder,))
     
     with col2:
         if recorder.is_recording():
-            # Real-time duration display
-            duration = recorder.get_recording_duration()
-            st.markdown(f"**🔴 Recording: {duration:.1f}s**")
-            
-            # Auto-refresh every second while recording
-            time.sleep(1)
-            st.rerun()
+            recording_status(recorder)
     
     with col3:
         if not meeting_title:
@@ -451,11 +559,114 @@ def microphone_recording_section(recorder):
                 )
                 
         with col2:
-            if st.button("🗑️ Discard Recording"):
-                recorder.cleanup()
-                st.session_state.recording_file = None
-                st.success("Recording discarded")
-                st.rerun()
+            st.button("🗑️ Discard Recording", on_click=discard_recording, args=(recorder,))
+
+def start_recording(recorder, device_index):
+    """Start recording and live transcription; used as a button callback"""
+    if recorder.start_recording(device_index):
+        start_live_transcription(recorder)
+        st.toast("🎙️ Recording started!")
+    else:
+        st.error("❌ Failed to start recording")
+
+def stop_recording(recorder):
+    """Stop recording and keep the file for processing; used as a button callback"""
+    audio_file = recorder.stop_recording()
+    stop_live_transcription()
+    if audio_file:
+        st.session_state.recording_file = audio_file
+        st.toast("✅ Recording stopped!")
+    else:
+        st.error("❌ Failed to stop recording")
+
+def discard_recording(recorder):
+    """Drop the recorded file and its live transcript; used as a button callback"""
+    stop_live_transcription()
+    st.session_state.pop('live_transcription', None)
+    recorder.cleanup()
+    st.session_state.recording_file = None
+    st.toast("Recording discarded")
+
+@st.fragment(run_every=1.0)
+def recording_status(recorder):
+    """Refresh the recording duration and live transcript without rerunning the page"""
+    duration = recorder.get_recording_duration()
+    st.markdown(f"**🔴 Recording: {duration:.1f}s**")
+    live = st.session_state.get('live_transcription')
+    if live and live['transcriber'].committed_text:
+        st.caption(f"…{live['transcriber'].committed_text[-200:]}")
+
+@st.cache_data(ttl=30, show_spinner=False)
+def list_audio_devices(_recorder):
+    """Enumerate input devices at most every 30 seconds instead of on every rerun"""
+    return _recorder.get_audio_devices()
+
+def start_live_transcription(recorder):
+    """Transcribe on a worker while recording, so the transcript is ready at Stop"""
+    st.session_state.pop('live_transcription', None)
+    if st.session_state.use_whisper_server:
+        return
+    
+    transcriber = services['transcription'].create_live_transcriber()
+    if not transcriber:
+        return
+    
+    # Its own daemon thread: the loop lives as long as the recording, and holding a
+    # shared pool worker that long would starve other sessions' uploads and warmups
+    stopped = threading.Event()
+    future = Future()
+    threading.Thread(
+        target=run_live_transcription,
+        args=(recorder, transcriber, stopped, future),
+        name="privanote-live",
+        daemon=True
+    ).start()
+    st.session_state.live_transcription = {
+        'transcriber': transcriber,
+        'stopped': stopped,
+        'future': future
+    }
+
+def stop_live_transcription():
+    """Tell the live transcription worker that no more audio is coming"""
+    live = st.session_state.get('live_transcription')
+    if live:
+        live['stopped'].set()
+
+def run_live_transcription(recorder, transcriber, stopped, future):
+    """Run the live transcription loop on its thread and resolve future with the transcript"""
+    try:
+        future.set_result(live_transcription_loop(recorder, transcriber, stopped))
+    except Exception as e:
+        future.set_exception(e)
+
+def live_transcription_loop(recorder, transcriber, stopped):
+    """Feed recorder audio to the transcriber until recording stops; runs off the script thread"""
+    consumed = 0
+    pending_seconds = 0.0
+    started = time.monotonic()
+    while True:
+        # Stop, Discard and Process set `stopped`; also end once the recorder has shut
+        # its stream, or after the cap, so an abandoned session can't keep this running
+        finished = (
+            stopped.is_set()
+            or (not recorder.is_recording() and recorder.stream is None)
+            or time.monotonic() - started > LIVE_TRANSCRIPTION_MAX_SECONDS
+        )
+        audio = recorder.get_audio(consumed)
+        if len(audio):
+            consumed += len(audio)
+            pending_seconds += transcriber.insert_audio([audio])
+        
+        if finished:
+            return transcriber.finish()
+        
+        # Re-run Whisper once at least a second of new audio has arrived
+        if pending_seconds >= 1.0:
+            transcriber.process()
+            pending_seconds = 0.0
+        else:
+            stopped.wait(0.25)
 
 def system_audio_section():
     st.markdown("### System Audio Capture")
@@ -553,6 +764,7 @@ def virtual_meeting_section():
 def recording_instructions_section():
     st.markdown("### 📖 Recording Methods Guide")
     
+    from utils.audio_recorder import get_recording_instructions
     instructions = get_recording_instructions()
     
     for method_key, method_info in instructions.items():
@@ -572,23 +784,138 @@ def recording_instructions_section():
             
             st.markdown(f"**🎯 Best for:** {method_info['best_for']}")
 
+def run_audio_pipeline(audio_path, progress_bar, status_text):
+    """Decode audio once, then stream partial transcripts to the UI"""
+    # Overlap the TLS handshake with Whisper instead of paying it after transcription;
+    # the warmup is fire-and-forget, so nothing waits on it
+    get_background_executor().submit(current_ai_service().warmup)
+    
+    if st.session_state.use_whisper_server:
+        return transcribe_on_server(audio_path, progress_bar, status_text)
+    
+    # A single decode feeds both the metadata and Whisper
+    transcription = services['transcription']
+    # Load on this thread: the loader reports progress with st.* calls
+    if not transcription.ensure_model():
+        raise Exception("Whisper model not initialized")
+    samples = transcription.load_audio(audio_path)
+    audio_info = services['audio'].describe_samples(samples, transcription.sample_rate, audio_path)
+    progress_bar.progress(30)
+    
+    # Whisper decodes on a worker while this thread shows each segment as it arrives
+    transcript_parts = []
+    for text, progress in iterate_in_background(transcription.transcribe_stream, samples):
+        transcript_parts.append(text)
+        progress_bar.progress(min(30 + int(30 * progress), 60))
+        status_text.text(f"🎯 Transcribing... {text[-80:]}")
+    
+    transcript = transcription.join_segments(transcript_parts)
+    return audio_info, transcript
+
+def iterate_in_background(generator_fn, *args):
+    """
+    Run a generator on the transcription executor and yield its items here
+    
+    The producer keeps working while the script thread renders, and stops
+    early if the script is interrupted. generator_fn must not call st.*.
+    """
+    items = queue.Queue()
+    stopped = threading.Event()
+    done = object()
+    
+    def produce():
+        try:
+            for item in generator_fn(*args):
+                if stopped.is_set():
+                    break
+                items.put(item)
+        finally:
+            items.put(done)
+    
+    future = get_transcription_executor().submit(produce)
+    queued_at = time.monotonic()
+    try:
+        while True:
+            try:
+                item = items.get(timeout=0.5)
+            except queue.Empty:
+                # A producer that never started can't put `done`; don't wait on it forever
+                raise_if_not_started(future, queued_at)
+                continue
+            if item is done:
+                break
+            yield item
+        # Re-raise anything the producer failed with
+        future.result()
+    finally:
+        stopped.set()
+
+def transcribe_on_server(audio_path, progress_bar, status_text):
+    """Upload audio to the configured Whisper server, polling it from the script thread"""
+    remote = get_remote_transcription(st.session_state.whisper_server_config)
+    future = get_transcription_executor().submit(remote.transcribe, audio_path)
+    queued_at = time.monotonic()
+    
+    # Read the metadata locally while the server works
+    transcription = services['transcription']
+    samples = transcription.load_audio(audio_path)
+    audio_info = services['audio'].describe_samples(samples, transcription.sample_rate, audio_path)
+    del samples
+    progress_bar.progress(30)
+    
+    started = time.time()
+    while not future.done():
+        raise_if_not_started(future, queued_at)
+        status_text.text(f"🛰️ Transcribing on Whisper server... {int(time.time() - started)}s")
+        time.sleep(0.5)
+    
+    transcript = transcription.join_segments([future.result()])
+    return audio_info, transcript
+
+def analyze_with_preview(transcript):
+    """Run AI analysis, rendering the summary as it streams in"""
+    cache_key = analysis_cache_key(transcript)
+    cached = get_session_cached('analysis_cache', cache_key)
+    if cached:
+        # Same transcript and model as an earlier run, e.g. a retry after editing the title
+        return dict(cached)
+    
+    summary_preview = st.empty()
+    analysis = current_ai_service().analyze_meeting(
+        transcript,
+        on_progress=lambda summary: summary_preview.markdown(f"**Summary (drafting):** {summary}")
+    )
+    summary_preview.empty()
+    store_analysis(cache_key, analysis)
+    return analysis
+
 def process_recorded_audio(audio_file_path, title, date, notes):
     """Process audio recorded from microphone"""
     progress_bar = st.progress(0)
     status_text = st.empty()
     
     try:
-        # Step 1: Process audio
-        status_text.text("🎵 Processing recorded audio...")
-        progress_bar.progress(20)
-        
-        audio_info = services['audio'].process_audio(audio_file_path)
-        
-        # Step 2: Transcribe
-        status_text.text("🎯 Transcribing audio (this may take a while)...")
-        progress_bar.progress(30)
+        # Step 1 & 2: Use the transcript built during recording, if there is one
+        live = st.session_state.pop('live_transcription', None)
+        live_transcript = None
+        if live:
+            status_text.text("🎯 Finishing live transcript...")
+            progress_bar.progress(20)
+            live['stopped'].set()
+            try:
+                live_transcript = live['future'].result()
+            except Exception as e:
+                st.warning(f"Live transcription failed, transcribing the full recording instead: {str(e)}")
         
-        transcript = services['transcription'].transcribe(audio_file_path)
+        if live_transcript:
+            # The recorder wrote this WAV, so its header has the duration; decoding the
+            # whole meeting just to measure it would undo the live transcript's head start
+            audio_info = services['audio'].describe_wav(audio_file_path)
+            transcript = services['transcription'].join_segments([live_transcript])
+        else:
+            status_text.text("🎯 Processing and transcribing audio (this may take a while)...")
+            progress_bar.progress(20)
+            audio_info, transcript = run_audio_pipeline(audio_file_path, progress_bar, status_text)
         progress_bar.progress(60)
         
         if not transcript or not transcript.strip():
@@ -599,7 +926,7 @@ def process_recorded_audio(audio_file_path, title, date, notes):
         status_text.text("🤖 Analyzing transcript with AI...")
         progress_bar.progress(70)
         
-        analysis = st.session_state.ai_service.analyze_meeting(transcript)
+        analysis = analyze_with_preview(transcript)
         progress_bar.progress(90)
         
         # Step 4: Store meeting
@@ -626,12 +953,9 @@ def process_recorded_audio(audio_file_path, title, date, notes):
         st.session_state.audio_recorder.cleanup()
         st.session_state.recording_file = None
         
-        # Display results
+        # Display results; Quick Stats render after this tab, so they already include it
         display_meeting_results(meeting_data)
         
-        # Rerun to update sidebar stats
-        st.rerun()
-        
     except Exception as e:
         st.error(f"❌ Error processing recording: {str(e)}")
         if st.session_state.audio_recorder:
@@ -640,17 +964,12 @@ def process_recorded_audio(audio_file_path, title, date, notes):
 def upload_and_analyze_tab():
     st.header("Upload Meeting Audio")
     
-    # Get current AI service from session state
-    ai_service = st.session_state.get('ai_service')
-    if not ai_service:
-        ai_service = AIAnalysisService()
-        st.session_state.ai_service = ai_service
-    
     # File upload
-    uploaded_file = st.file_uploader(
-        "Choose an audio file",
+    uploaded_files = st.file_uploader(
+        "Choose audio files",
         type=['wav', 'mp3', 'mp4', 'm4a', 'flac', 'ogg'],
-        help="Supported formats: WAV, MP3, MP4, M4A, FLAC, OGG"
+        accept_multiple_files=True,
+        help="Supported formats: WAV, MP3, MP4, M4A, FLAC, OGG. Several files are saved as separate meetings."
     )
     
     # Meeting metadata
@@ -662,35 +981,20 @@ def upload_and_analyze_tab():
     
     meeting_notes = st.text_area("Additional Notes (Optional)", placeholder="Any context or notes about this meeting...")
     
-    if uploaded_file is not None and meeting_title:
-        if st.button("🚀 Process Meeting", type="primary"):
-            process_meeting(uploaded_file, meeting_title, meeting_date, meeting_notes)
+    if uploaded_files and meeting_title:
+        if len(uploaded_files) == 1:
+            if st.button("🚀 Process Meeting", type="primary"):
+                process_meeting(uploaded_files[0], meeting_title, meeting_date, meeting_notes)
+        elif st.button(f"🚀 Process {len(uploaded_files)} Meetings", type="primary"):
+            process_meetings_batch(uploaded_files, meeting_title, meeting_date, meeting_notes)
 
 def process_meeting(uploaded_file, title, date, notes):
     progress_bar = st.progress(0)
     status_text = st.empty()
-    temp_path = None  # Initialize temp_path
     
     try:
-        # Step 1: Save uploaded file
-        status_text.text("📁 Saving audio file...")
-        progress_bar.progress(10)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-            tmp_file.write(uploaded_file.read())
-            temp_path = tmp_file.name
-        
-        # Step 2: Process audio
-        status_text.text("🎵 Processing audio...")
-        progress_bar.progress(20)
-        
-        audio_info = services['audio'].process_audio(temp_path)
-        
-        # Step 3: Transcribe
-        status_text.text("🎯 Transcribing audio (this may take a while)...")
-        progress_bar.progress(30)
-        
-        transcript = services['transcription'].transcribe(temp_path)
+        # Step 1-3: Save, decode and transcribe the upload
+        audio_info, transcript = transcribe_upload(uploaded_file, progress_bar, status_text)
         progress_bar.progress(60)
         
         if not transcript or not transcript.strip():
@@ -701,45 +1005,196 @@ def process_meeting(uploaded_file, title, date, notes):
         status_text.text("🤖 Analyzing transcript with AI...")
         progress_bar.progress(70)
         
-        analysis = st.session_state.ai_service.analyze_meeting(transcript)
+        analysis = analyze_with_preview(transcript)
         progress_bar.progress(90)
         
         # Step 5: Store meeting
         status_text.text("💾 Saving meeting data...")
         
-        meeting_data = {
-            'id': datetime.now().isoformat(),
-            'title': title,
-            'date': str(date),
-            'notes': notes,
-            'duration': audio_info['duration'],
-            'file_size': audio_info['file_size'],
-            'transcript': transcript,
-            'analysis': analysis,
-            'created_at': datetime.now().isoformat()
-        }
-        
+        meeting_data = build_meeting_data(title, date, notes, audio_info, transcript, analysis)
         services['storage'].save_meeting(meeting_data)
         progress_bar.progress(100)
         status_text.text("✅ Meeting processed successfully!")
         
-        # Clean up temp file
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
-        
-        # Display results
+        # Display results; Quick Stats render after this tab, so they already include it
         display_meeting_results(meeting_data)
         
-        # Rerun to update sidebar stats
-        st.rerun()
-        
     except Exception as e:
         st.error(f"❌ Error processing meeting: {str(e)}")
-        if 'temp_path' in locals() and temp_path:
+
+def process_meetings_batch(uploaded_files, title, date, notes):
+    """Transcribe uploads one at a time while earlier ones are analyzed in parallel
+    
+    Whisper keeps the CPU/GPU busy on the script thread and the analysis requests
+    wait on the network in a pool, so each meeting is saved as soon as both are done.
+    """
+    ai_service = current_ai_service()
+    pending = []  # (future, meeting fields, status row) awaiting analysis
+    saved = 0
+    
+    def save_finished(wait):
+        """Save meetings whose analysis is done, in upload order; blocks if wait"""
+        nonlocal saved
+        while pending and (wait or pending[0][0].done()):
+            future, fields, row = pending.pop(0)
             try:
+                analysis = future.result()
+                store_analysis(analysis_cache_key(fields['transcript']), analysis)
+                meeting_data = build_meeting_data(analysis=analysis, **fields)
+                services['storage'].save_meeting(meeting_data)
+                saved += 1
+                row.text(f"✅ {meeting_data['title']}")
+            except Exception as e:
+                row.error(f"❌ {fields['title']}: {str(e)}")
+    
+    with st.status(f"Processing {len(uploaded_files)} meetings...", expanded=True) as status:
+        with ai_service.analysis_executor() as analysis_pool:
+            for number, uploaded_file in enumerate(uploaded_files, 1):
+                meeting_title = f"{title} ({number}/{len(uploaded_files)})"
+                row = st.empty()
+                progress_bar = st.progress(0)
+                try:
+                    audio_info, transcript = transcribe_upload(uploaded_file, progress_bar, row)
+                except Exception as e:
+                    row.error(f"❌ {uploaded_file.name}: {str(e)}")
+                    continue
+                finally:
+                    progress_bar.empty()
+                
+                if not transcript or not transcript.strip():
+                    row.warning(f"⚠️ {uploaded_file.name}: no speech detected, skipped")
+                    continue
+                
+                row.text(f"🤖 {meeting_title}: analyzing...")
+                fields = {
+                    'title': meeting_title,
+                    'date': date,
+                    'notes': notes,
+                    'audio_info': audio_info,
+                    'transcript': transcript
+                }
+                cached = get_session_cached('analysis_cache', analysis_cache_key(transcript))
+                if cached:
+                    future = Future()
+                    future.set_result(dict(cached))
+                else:
+                    future = analysis_pool.submit(ai_service.analyze_meeting, transcript)
+                pending.append((future, fields, row))
+                save_finished(wait=False)
+            
+            save_finished(wait=True)
+        
+        status.update(
+            label=f"Saved {saved} of {len(uploaded_files)} meetings",
+            state="complete" if saved == len(uploaded_files) else "error"
+        )
+
+def transcribe_upload(uploaded_file, progress_bar, status_text):
+    """
+    Transcribe an uploaded file, reusing this session's transcript of identical audio
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile
+        progress_bar: st.progress element, advanced from 10 to 60
+        status_text: Element whose text() shows the current step
+        
+    Returns:
+        tuple: (audio_info, transcript)
+    """
+    status_text.text(f"📁 Saving {uploaded_file.name}...")
+    progress_bar.progress(10)
+    
+    cache_key = transcript_cache_key(uploaded_file)
+    cached = get_session_cached('transcript_cache', cache_key)
+    if cached:
+        # Same audio and transcription settings as an earlier run: skip Whisper
+        return cached
+    
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
+            # Uploads are already held in memory; write a view of that buffer, not a copy
+            tmp_file.write(uploaded_file.getbuffer())
+            temp_path = tmp_file.name
+        
+        status_text.text("🎯 Processing and transcribing audio (this may take a while)...")
+        progress_bar.progress(20)
+        
+        audio_info, transcript = run_audio_pipeline(temp_path, progress_bar, status_text)
+        if transcript and transcript.strip():
+            store_session_cached('transcript_cache', cache_key, (audio_info, transcript), TRANSCRIPT_CACHE_ENTRIES)
+        return audio_info, transcript
+    finally:
+        # Delete exactly once on every path, including errors
+        if temp_path:
+            with contextlib.suppress(FileNotFoundError):
                 os.unlink(temp_path)
-            except Exception:
-                pass
+
+def build_meeting_data(title, date, notes, audio_info, transcript, analysis):
+    """Assemble the stored record for an uploaded meeting"""
+    return {
+        'id': datetime.now().isoformat(),
+        'title': title,
+        'date': str(date),
+        'notes': notes,
+        'duration': audio_info['duration'],
+        'file_size': audio_info['file_size'],
+        'transcript': transcript,
+        'analysis': analysis,
+        'created_at': datetime.now().isoformat()
+    }
+
+@st.fragment
+def render_transcript(meeting_id, transcript):
+    """Show the start of a transcript; the full text is only sent once asked for"""
+    full_key = f"full_transcript_{meeting_id}"
+    if len(transcript) <= TRANSCRIPT_PREVIEW_CHARS or st.session_state.get(full_key):
+        st.text_area("Transcript", transcript, height=400, disabled=True)
+        return
+    
+    # Cut at a word boundary so the preview doesn't end mid-word
+    preview = transcript[:TRANSCRIPT_PREVIEW_CHARS].rsplit(' ', 1)[0]
+    st.text_area("Transcript", f"{preview} …", height=400, disabled=True)
+    st.caption(f"Showing the first {len(preview):,} of {len(transcript):,} characters.")
+    if st.button("📜 Show full transcript", key=f"show_{full_key}"):
+        st.session_state[full_key] = True
+        st.rerun(scope="fragment")
+
+def transcript_cache_key(uploaded_file):
+    """Identify an upload by its content and the settings that shape its transcript"""
+    # Hash the buffer Streamlit already holds; a re-upload or retry gets the same digest
+    digest = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+    if st.session_state.use_whisper_server:
+        return digest, 'server', tuple(sorted(st.session_state.whisper_server_config.items()))
+    return digest, 'local', services['transcription'].model_size
+
+def analysis_cache_key(transcript):
+    """Identify an analysis by transcript content and the provider/model that produces it"""
+    provider = st.session_state.ai_provider
+    digest = hashlib.blake2b(transcript.encode('utf-8'), digest_size=16).hexdigest()
+    return digest, provider, get_provider_model(provider)
+
+def get_session_cached(cache_name, cache_key):
+    """Get a value from a per-session LRU cache, or None"""
+    cache = st.session_state.setdefault(cache_name, {})
+    if cache_key not in cache:
+        return None
+    # Move to the end so the least recently used entry is evicted first
+    cache[cache_key] = cache.pop(cache_key)
+    return cache[cache_key]
+
+def store_session_cached(cache_name, cache_key, value, max_entries):
+    """Put a value in a per-session LRU cache, evicting the oldest entry when full"""
+    cache = st.session_state.setdefault(cache_name, {})
+    if len(cache) >= max_entries:
+        cache.pop(next(iter(cache)))
+    cache[cache_key] = value
+
+def store_analysis(cache_key, analysis):
+    """Cache an AI analysis unless it is the keyword fallback after a failed call"""
+    # A retry should reach the provider again rather than replay the failure
+    if analysis.get('provider') != FALLBACK_PROVIDER:
+        store_session_cached('analysis_cache', cache_key, analysis, ANALYSIS_CACHE_ENTRIES)
 
 def display_meeting_results(meeting_data):
     st.success("🎉 Meeting analysis complete!")
@@ -756,7 +1211,7 @@ def display_meeting_results(meeting_data):
     
     with tab2:
         st.subheader("Full Transcript")
-        st.text_area("Transcript", meeting_data['transcript'], height=400, disabled=True)
+        render_transcript(meeting_data['id'], meeting_data['transcript'])
         
         # Audio info
         col1, col2 = st.columns(2)
@@ -787,79 +1242,146 @@ def display_meeting_results(meeting_data):
     st.markdown("---")
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("📄 Export as Markdown"):
-            markdown_content = services['export'].to_markdown(meeting_data)
-            st.download_button(
-                label="Download Markdown File",
-                data=markdown_content,
-                file_name=f"{meeting_data['title']}_{meeting_data['date']}.md",
-                mime="text/markdown"
-            )
+        lazy_download_button(
+            "📄 Export as Markdown",
+            meeting_data,
+            'markdown',
+            key=f"result_md_{meeting_data['id']}"
+        )
     
     with col2:
-        if st.button("📊 Export as JSON"):
-            import json
-            json_content = json.dumps(meeting_data, indent=2)
-            st.download_button(
-                label="Download JSON File",
-                data=json_content,
-                file_name=f"{meeting_data['title']}_{meeting_data['date']}.json",
-                mime="application/json"
-            )
+        lazy_download_button(
+            "📊 Export as JSON",
+            meeting_data,
+            'json',
+            key=f"result_json_{meeting_data['id']}"
+        )
+
+def get_export_content(meeting_id, revision, format_type):
+    """Build an export once per meeting revision and reuse it on later reruns"""
+    # Keyed on ID and revision only, so lookups never hash the transcript
+    cache = st.session_state.setdefault('export_cache', {})
+    cache_key = (meeting_id, revision, format_type)
+    
+    if cache_key in cache:
+        # Move to the end so the least recently downloaded export is evicted first
+        cache[cache_key] = cache.pop(cache_key)
+        return cache[cache_key]
+    
+    if len(cache) >= EXPORT_CACHE_ENTRIES:
+        cache.pop(next(iter(cache)))
+    meeting = services['storage'].get_meeting(meeting_id)
+    # Store bytes so download_button doesn't re-encode the file on every rerun it's shown
+    if format_type == 'json':
+        cache[cache_key] = serialization.dumps_bytes(meeting, pretty=True)
+    else:
+        cache[cache_key] = services['export'].to_markdown(meeting).encode('utf-8')
+    
+    return cache[cache_key]
+
+def lazy_download_button(label, meeting, format_type, key):
+    """Show an export button that only builds the file once the user asks for it
+    
+    The prepared download is shown until it is clicked once, then the slot
+    goes back to the prepare button.
+    """
+    extension, mime = ('json', 'application/json') if format_type == 'json' else ('md', 'text/markdown')
+    prepared_key = f"prepared_{key}"
+    slot = st.empty()
+    
+    if not st.session_state.get(prepared_key):
+        if not slot.button(label, key=f"prepare_{key}"):
+            return
+        st.session_state[prepared_key] = True
+    
+    slot.download_button(
+        label=f"⬇️ Download {extension.upper()} File",
+        data=get_export_content(
+            meeting['id'],
+            meeting.get('updated_at', meeting.get('saved_at')),
+            format_type
+        ),
+        file_name=f"{meeting['title']}_{meeting['date']}.{extension}",
+        mime=mime,
+        key=key,
+        # Go back to the cheap button so later reruns don't resend the file
+        on_click=clear_session_flag,
+        args=(prepared_key,)
+    )
+
+def set_session_flag(key):
+    """Set a session state flag; used as a widget callback"""
+    st.session_state[key] = True
+
+def clear_session_flag(key):
+    """Drop a session state flag; used as a widget callback"""
+    st.session_state.pop(key, None)
 
 def meeting_archive_tab():
     st.header("Meeting Archive")
     
-    meetings = services['storage'].get_all_meetings()
+    # The table only needs listing fields; the selected meeting is loaded in full
+    meetings = services['storage'].get_all_meetings(order='desc', fields=LISTING_FIELDS)
     
     if not meetings:
         st.info("No meetings found. Upload your first meeting to get started!")
         return
     
-    # Display meetings
-    for meeting in reversed(meetings):  # Show newest first
-        with st.expander(f"📅 {meeting['title']} - {meeting['date']}", expanded=False):
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Duration", f"{meeting['duration']:.1f} min")
-            with col2:
-                st.metric("Date", meeting['date'])
-            with col3:
-                if st.button("🗑️ Delete", key=f"del_{meeting['id']}"):
-                    services['storage'].delete_meeting(meeting['id'])
-                    st.rerun()
-            
-            if meeting.get('notes'):
-                st.markdown(f"**Notes:** {meeting['notes']}")
-            
-            # Quick view of analysis
-            if meeting['analysis'].get('summary'):
-                st.markdown("**Summary:**")
-                st.markdown(meeting['analysis']['summary'][:200] + "..." if len(meeting['analysis']['summary']) > 200 else meeting['analysis']['summary'])
-            
-            # Export for individual meeting
-            col1, col2 = st.columns(2)
-            with col1:
-                markdown_content = services['export'].to_markdown(meeting)
-                st.download_button(
-                    label="📄 Export Markdown",
-                    data=markdown_content,
-                    file_name=f"{meeting['title']}_{meeting['date']}.md",
-                    mime="text/markdown",
-                    key=f"md_{meeting['id']}"
-                )
-            
-            with col2:
-                if st.button("👁️ View Details", key=f"view_{meeting['id']}"):
-                    st.session_state.current_meeting = meeting
-                    st.rerun()
+    # One table for the whole archive instead of a widget set per meeting
+    event = st.dataframe(
+        get_archive_table(meetings),
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="archive_table"
+    )
+    
+    selected_rows = event.selection.rows
+    selected = None
+    if selected_rows and selected_rows[0] < len(meetings):
+        selected = services['storage'].get_meeting(meetings[selected_rows[0]]['id'])
+    
+    if selected:
+        render_archive_meeting(selected)
+    else:
+        st.caption("Select a meeting to view details and export options.")
     
     # Bulk operations
     if len(meetings) > 1:
         st.markdown("---")
         st.subheader("Bulk Operations")
-        if st.button("🗑️ Clear All Meetings", type="secondary"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if st.session_state.get('prepared_archive_zip'):
+                st.download_button(
+                    label="⬇️ Download ZIP Archive",
+                    data=get_archive_zip(),
+                    file_name=f"privanote_meetings_{datetime.now().strftime('%Y-%m-%d')}.zip",
+                    mime="application/zip",
+                    key="archive_zip",
+                    on_click=clear_session_flag,
+                    args=('prepared_archive_zip',)
+                )
+            else:
+                st.button("📦 Export All as ZIP", on_click=set_session_flag, args=('prepared_archive_zip',))
+        
+        with col2:
+            reanalyze_clicked = st.button("🧠 Re-analyze All")
+            offline = False
+            if st.session_state.ai_provider == 'openai' and current_ai_service().is_available():
+                offline = st.checkbox("Process offline (50% cheaper, results within 24h)", key="reanalyze_offline")
+        
+        with col3:
+            clear_all_clicked = st.button("🗑️ Clear All Meetings", type="secondary")
+        
+        if reanalyze_clicked:
+            if offline:
+                submit_offline_reanalysis()
+            else:
+                reanalyze_all_meetings()
+        
+        if clear_all_clicked:
             if st.session_state.get('confirm_clear'):
                 services['storage'].clear_all_meetings()
                 st.session_state.confirm_clear = False
@@ -868,66 +1390,195 @@ def meeting_archive_tab():
             else:
                 st.session_state.confirm_clear = True
                 st.warning("Click again to confirm deletion of all meetings.")
+    
+    offline_analysis_status()
 
-def search_meetings_tab():
-    st.header("Search Meetings")
+def reanalyze_all_meetings():
+    """Re-run AI analysis on every archived meeting with the current provider"""
+    storage = services['storage']
+    meetings = storage.get_all_meetings()
     
+    with st.spinner(f"Re-analyzing {len(meetings)} meetings..."):
+        analyses = current_ai_service().analyze_many(
+            [meeting.get('transcript', '') for meeting in meetings]
+        )
+    
+    for meeting, analysis in zip(meetings, analyses):
+        storage.update_meeting(meeting['id'], {**meeting, 'analysis': analysis})
+    
+    st.success(f"Re-analyzed {len(meetings)} meetings!")
+    st.rerun()
+
+def submit_offline_reanalysis():
+    """Queue every archived meeting for analysis with the OpenAI Batch API"""
     meetings = services['storage'].get_all_meetings()
+    try:
+        with st.spinner(f"Submitting {len(meetings)} meetings for offline analysis..."):
+            batch_id = current_ai_service().submit_batch(
+                [meeting.get('transcript', '') for meeting in meetings]
+            )
+    except Exception as e:
+        st.error(f"Failed to submit offline analysis: {str(e)}")
+        return
     
-    if not meetings:
+    st.session_state.pending_batch = {'id': batch_id, 'meeting_ids': [meeting['id'] for meeting in meetings]}
+
+def offline_analysis_status():
+    """Show the pending offline analysis batch and apply its results once it finishes"""
+    pending = st.session_state.get('pending_batch')
+    if not pending:
+        return
+    
+    st.info(
+        f"🕒 Offline analysis of {len(pending['meeting_ids'])} meetings is queued. "
+        "Results arrive within 24 hours; keep this session open to apply them."
+    )
+    if not st.button("🔄 Check Offline Analysis"):
+        return
+    
+    try:
+        status, results = current_ai_service().poll_batch(pending['id'])
+    except Exception as e:
+        st.error(f"Failed to check offline analysis: {str(e)}")
+        return
+    
+    if results is None:
+        st.caption(f"Batch status: {status.replace('_', ' ')}")
+        return
+    
+    # Meetings deleted since submitting are skipped; failed requests keep their old analysis
+    storage = services['storage']
+    applied = 0
+    for index, meeting_id in enumerate(pending['meeting_ids']):
+        meeting = storage.get_meeting(meeting_id)
+        if meeting and index in results:
+            storage.update_meeting(meeting_id, {**meeting, 'analysis': results[index]})
+            applied += 1
+    
+    del st.session_state.pending_batch
+    st.toast(f"Offline analysis {status}: updated {applied} of {len(pending['meeting_ids'])} meetings")
+    st.rerun()
+
+def get_archive_table(meetings):
+    """Build the archive DataFrame once per storage version instead of on every rerun"""
+    version = st.session_state.get('meetings_version', 0)
+    cached = st.session_state.get('archive_table_cache')
+    if not cached or cached['version'] != version:
+        # Only the archive table needs pandas, so it isn't imported at startup
+        import pandas as pd
+        
+        # Column-wise construction skips pandas' per-row dict handling
+        table = pd.DataFrame({
+            'Title': [meeting['title'] for meeting in meetings],
+            'Date': [meeting['date'] for meeting in meetings],
+            'Duration (min)': [round(meeting['duration'], 1) for meeting in meetings]
+        })
+        cached = {'version': version, 'table': table}
+        st.session_state.archive_table_cache = cached
+    return cached['table']
+
+def get_archive_zip():
+    """Build the Markdown ZIP of the archive once per storage version"""
+    version = st.session_state.get('meetings_version', 0)
+    cached = st.session_state.get('archive_zip_cache')
+    if not cached or cached['version'] != version:
+        meetings = services['storage'].get_all_meetings(order='desc')
+        cached = {'version': version, 'data': services['export'].to_markdown_zip(meetings)}
+        st.session_state.archive_zip_cache = cached
+    return cached['data']
+
+@st.fragment
+def render_archive_meeting(meeting):
+    """Render details and actions for the meeting selected in the archive table"""
+    # As a fragment, export and view clicks rerun only this block; a delete reruns
+    # the app because the archive table and sidebar totals change
+    with st.expander(f"📅 {meeting['title']} - {meeting['date']}", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Duration", f"{meeting['duration']:.1f} min")
+        with col2:
+            st.metric("Date", meeting['date'])
+        with col3:
+            if st.button("🗑️ Delete", key=f"del_{meeting['id']}"):
+                services['storage'].delete_meeting(meeting['id'])
+                # Row positions shift after a delete, so drop the stale selection
+                st.session_state.pop('archive_table', None)
+                st.rerun()
+        
+        if meeting.get('notes'):
+            st.markdown(f"**Notes:** {meeting['notes']}")
+        
+        # Quick view of analysis
+        if meeting.get('summary_snippet'):
+            st.markdown("**Summary:**")
+            st.markdown(meeting['summary_snippet'])
+        
+        # Export for individual meeting
+        col1, col2 = st.columns(2)
+        with col1:
+            lazy_download_button("📄 Export Markdown", meeting, 'markdown', key=f"md_{meeting['id']}")
+        
+        with col2:
+            if st.button("👁️ View Details", key=f"view_{meeting['id']}"):
+                st.session_state.current_meeting = meeting
+                # Only session state changes, nothing outside this block needs redrawing
+                st.rerun(scope="fragment")
+
+def search_meetings_tab():
+    st.header("Search Meetings")
+    
+    if not services['storage'].get_totals()['total_meetings']:
         st.info("No meetings to search. Upload some meetings first!")
         return
     
-    # Search input
+    search_panel()
+
+@st.fragment
+def search_panel():
+    """Search box and results; a new query reruns only this panel, not the whole app"""
+    # text_input submits on Enter or blur, so typing alone doesn't trigger a search
     search_query = st.text_input("🔍 Search in transcripts and summaries", placeholder="Enter keywords...")
     
     if search_query:
-        # Simple text search
-        matching_meetings = []
-        query_lower = search_query.lower()
-        
-        for meeting in meetings:
-            # Search in transcript, summary, title, and notes
-            searchable_text = " ".join([
-                meeting.get('title', ''),
-                meeting.get('transcript', ''),
-                meeting.get('notes', ''),
-                meeting['analysis'].get('summary', ''),
-                " ".join(meeting['analysis'].get('action_items', [])),
-                " ".join(meeting['analysis'].get('key_decisions', []))
-            ]).lower()
-            
-            if query_lower in searchable_text:
-                matching_meetings.append(meeting)
+        # Indexed search over title, transcript, notes, and analysis
+        matching_meetings = services['storage'].search_meetings(search_query)
         
         if matching_meetings:
             st.success(f"Found {len(matching_meetings)} matching meeting(s)")
             
-            for meeting in matching_meetings:
-                with st.expander(f"📅 {meeting['title']} - {meeting['date']}", expanded=True):
-                    # Highlight search terms in summary
-                    summary = meeting['analysis'].get('summary', 'No summary available')
-                    st.markdown("**Summary:**")
-                    st.markdown(summary)
-                    
-                    # Show action items if they contain search terms
-                    action_items = meeting['analysis'].get('action_items', [])
-                    if action_items:
-                        st.markdown("**Action Items:**")
-                        for item in action_items:
-                            st.markdown(f"• {item}")
-                    
-                    # Export button
-                    markdown_content = services['export'].to_markdown(meeting)
-                    st.download_button(
-                        label="📄 Export Markdown",
-                        data=markdown_content,
-                        file_name=f"{meeting['title']}_{meeting['date']}.md",
-                        mime="text/markdown",
-                        key=f"search_md_{meeting['id']}"
-                    )
+            # Only build widgets for one page of hits at a time
+            page_count = -(-len(matching_meetings) // SEARCH_PAGE_SIZE)
+            if st.session_state.get('search_page', 1) > page_count:
+                st.session_state.search_page = 1
+            page = 1
+            if page_count > 1:
+                page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="search_page")
+            
+            start = (page - 1) * SEARCH_PAGE_SIZE
+            for meeting in matching_meetings[start:start + SEARCH_PAGE_SIZE]:
+                render_search_hit(meeting)
         else:
             st.warning("No meetings found matching your search query.")
 
+@st.fragment
+def render_search_hit(meeting):
+    """Render one search result; its export button reruns only this fragment"""
+    with st.expander(f"📅 {meeting['title']} - {meeting['date']}", expanded=True):
+        # Highlight search terms in summary
+        summary = meeting['analysis'].get('summary', 'No summary available')
+        st.markdown("**Summary:**")
+        st.markdown(summary)
+        
+        # Show action items if they contain search terms
+        action_items = meeting['analysis'].get('action_items', [])
+        if action_items:
+            st.markdown("**Action Items:**")
+            for item in action_items:
+                st.markdown(f"• {item}")
+        
+        # Export button
+        lazy_download_button("📄 Export Markdown", meeting, 'markdown', key=f"search_md_{meeting['id']}")
+
 if __name__ == "__main__":
     main()
@@ -1,29 +1,181 @@
 import json
+import logging
 import os
+import re
+from bisect import bisect_right
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 import streamlit as st
+from utils import serialization
+from utils.http_client import get_http_client
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 try:
     import ollama
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# Ollama gemma3 tags by weight precision; lower precision means less memory traffic per token
+OLLAMA_MODEL_TAGS = {
+    'q4_K_M': 'gemma3:4b-it-q4_K_M',
+    'q8_0': 'gemma3:4b-it-q8_0',
+    'fp16': 'gemma3:4b-it-fp16'
+}
+DEFAULT_OLLAMA_QUANTIZATION = 'q4_K_M'
+OLLAMA_KEEP_ALIVE = '30m'  # Keep the model loaded between meetings instead of Ollama's 5 minute default
+
+# Transcript share of each prompt; tiktoken isn't a dependency, so tokens are estimated
+TRANSCRIPT_TOKEN_BUDGET = 12000
+CHARS_PER_TOKEN = 4  # Typical for English text with OpenAI and Gemma tokenizers
+MAP_CHUNK_TOKENS = 6000  # Transcript per map-step prompt when a meeting exceeds the budget
+MAP_CHUNK_OVERLAP_TOKENS = 200  # Repeated between chunks so no sentence is split unseen
+LM_STUDIO_PROBE_TIMEOUT = 2.0  # Seconds; availability checks only list models
+OPENAI_MAX_RETRIES = 5  # SDK retries with exponential backoff on 429/5xx, timeouts and dropped connections
+
+# Provider label on keyword-based results, including fallbacks after a failed AI call
+FALLBACK_PROVIDER = 'Basic Analysis'
+
+# Fields copied from a provider reply, with the type whose empty value fills a missing one
+_ANALYSIS_FIELDS = (
+    ('summary', str),
+    ('action_items', list),
+    ('key_decisions', list),
+    ('topics_discussed', list),
+    ('participants', list),
+    ('next_steps', list)
+)
+
+# Analysis prompts shared by every provider; only the requested format and closing
+# instruction differ, and the transcript is the one slot filled per call
+_SYSTEM_PROMPT_TEMPLATE = """You are an expert meeting analyst. Analyze the provided meeting transcript and extract key information in a structured {format}. Focus on being accurate and concise.
+
+Your analysis should include:
+1. A clear, concise summary of the meeting
+2. Specific action items with clear ownership when mentioned
+3. Key decisions that were made
+4. Main topics discussed
+5. Identified participants (if names are mentioned)
+6. Next steps or follow-up items
+
+Be precise and only include information that is clearly stated or strongly implied in the transcript. {closing}"""
+_OPENAI_SYSTEM_PROMPT = _SYSTEM_PROMPT_TEMPLATE.format(
+    format="format", closing="If something is unclear, don't make assumptions."
+)
+_OLLAMA_SYSTEM_PROMPT = _SYSTEM_PROMPT_TEMPLATE.format(
+    format="JSON format", closing="Respond only with valid JSON."
+)
+_LM_STUDIO_SYSTEM_PROMPT = _SYSTEM_PROMPT_TEMPLATE.format(
+    format="JSON format", closing="If something is unclear, don't make assumptions."
+)
+_ANALYSIS_USER_PROMPT = """Please analyze this meeting transcript and provide a comprehensive analysis:
+
+TRANSCRIPT:
+{}
+
+Respond with a JSON object containing:
+- summary: A concise 2-3 sentence summary of the meeting
+- action_items: Array of specific action items (what needs to be done)
+- key_decisions: Array of important decisions that were made
+- topics_discussed: Array of main topics/subjects discussed
+- participants: Array of participant names mentioned in the transcript
+- next_steps: Array of follow-up actions or next meeting items
+- confidence: A number between 0 and 1 indicating your confidence in the analysis"""
+
+# Structured-output schema so one request returns every analysis field, summary first
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "meeting_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "summary": {"type": "string"},
+                "action_items": _STRING_LIST,
+                "key_decisions": _STRING_LIST,
+                "topics_discussed": _STRING_LIST,
+                "participants": _STRING_LIST,
+                "next_steps": _STRING_LIST,
+                "confidence": {"type": "number"}
+            },
+            "required": [
+                "summary", "action_items", "key_decisions", "topics_discussed",
+                "participants", "next_steps", "confidence"
+            ],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Action-item cues for keyword extraction without AI; one alternation scans each sentence once
+_ACTION_RE = re.compile(r"need to \w+|will \w+|should \w+|action item|follow up|todo|task", re.IGNORECASE)
+
+# Basic-analysis cues, tagged by group so a single pass over the transcript finds both kinds
+_FALLBACK_KEYWORD_RE = re.compile(
+    r"(?P<action>todo|action|task|will do|should|need to|follow up)"
+    r"|(?P<decision>decided|agreed|conclusion|resolved|determined)",
+    re.IGNORECASE
+)
+
+# Sentence-ending punctuation; requiring whitespace after it keeps decimals ("3.5"),
+# URLs and file names in one sentence. Keyword cues never contain these characters.
+_SENTENCE_END_RE = re.compile(r'[.!?](?=\s|$)')
+
+# Whitespace-delimited words, matching str.split() for the no-AI summary
+_WORD_RE = re.compile(r'\S+')
+
+# Decodes one JSON value from an offset and reports where it ended
+_JSON_DECODER = json.JSONDecoder()
+
+# Matches the (possibly still open) "summary" string of a partially streamed JSON reply
+_PARTIAL_SUMMARY_RE = re.compile(r'"summary"\s*:\s*"((?:[^"\\]|\\.)*)(")?')
+
+@st.cache_resource(show_spinner=False)
+def _get_openai_client(api_key):
+    """Create one OpenAI client per API key, shared by services for every model"""
+    # A transient rate limit or outage should cost a short wait, not the AI result
+    return OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES, http_client=get_http_client())
+
+@st.cache_resource(show_spinner=False)
+def _get_lm_studio_client(base_url):
+    """Create one LM Studio client per server, shared by services for every model"""
+    # LM Studio uses OpenAI-compatible API - use "lm-studio" as API key
+    return OpenAI(
+        api_key="lm-studio",
+        base_url=base_url,
+        timeout=10.0,  # Add timeout for better error handling
+        http_client=get_http_client()
+    )
+
 class AIAnalysisService:
     """Handle AI-powered analysis of meeting transcripts with dual-mode support"""
     
     def __init__(self, provider='openai', model_name=None, lm_studio_config=None):
         self.provider = provider
         self.model_name = model_name or self._get_default_model()
+        # OpenAI models by task: full analysis vs. short single-field summaries/extractions
+        self.quality_model = 'gpt-4o'
+        self.fast_model = 'gpt-4o-mini'
         self.lm_studio_config = lm_studio_config or {'host': 'localhost', 'port': 1234}
         self.openai_client = self._initialize_openai_client()
-        self.ollama_available = self._check_ollama_availability()
         self.lm_studio_client = self._initialize_lm_studio_client()
-        self.lm_studio_available = self._check_lm_studio_availability()
+        # Reachability changes while the cached service lives on; callers refresh it
+        # with refresh_availability() instead of it being frozen at construction
+        self.ollama_available = False
+        self.lm_studio_available = False
+        self.lm_studio_error = None
+        # Model names seen by the last probe, so listing providers needs no second request
+        self.ollama_models = []
+        self.lm_studio_models = []
         
     def _get_default_model(self):
         """Get default model for the selected provider"""
         if self.provider == 'ollama':
-            return 'gemma3'
+            return OLLAMA_MODEL_TAGS[DEFAULT_OLLAMA_QUANTIZATION]
         elif self.provider == 'lm_studio':
             return 'google/gemma-3n-e4b'
         return 'gpt-4o'
@@ -33,18 +185,39 @@ class AIAnalysisService:
         if not OLLAMA_AVAILABLE:
             return False
         try:
-            # Test Ollama connection
-            ollama.list()
-            return True
+            # Test Ollama connection; the listing doubles as the provider's model list
+            models_response = ollama.list()
         except Exception:
             return False
+        
+        # Reachability is decided above; a response shape we don't expect only costs the names
+        try:
+            self.ollama_models = self._ollama_model_names(models_response)
+        except Exception:
+            self.ollama_models = []
+        return True
+    
+    def _ollama_model_names(self, models_response):
+        """Model tags from an ollama.list() response, for typed (0.4+) and dict responses"""
+        models = getattr(models_response, 'models', None)
+        if models is None:
+            models = models_response.get('models', [])
+        names = []
+        for model in models:
+            # ListResponse.Model has 'model'; older dict responses used 'name'
+            name = getattr(model, 'model', None)
+            if name is None and isinstance(model, dict):
+                name = model.get('model') or model.get('name')
+            if name:
+                names.append(name)
+        return names
     
     def _initialize_openai_client(self):
         """Initialize OpenAI client"""
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             return None
-        return OpenAI(api_key=api_key)
+        return _get_openai_client(api_key)
         
     def _initialize_lm_studio_client(self):
         """Initialize LM Studio client (OpenAI-compatible)"""
@@ -53,44 +226,55 @@ class AIAnalysisService:
             port = self.lm_studio_config.get('port', 1234)
             base_url = f"http://{host}:{port}/v1"
             
-            # LM Studio uses OpenAI-compatible API - use "lm-studio" as API key
-            client = OpenAI(
-                api_key="lm-studio",
-                base_url=base_url,
-                timeout=10.0  # Add timeout for better error handling
-            )
-            return client
+            return _get_lm_studio_client(base_url)
         except Exception as e:
-            st.error(f"Failed to initialize LM Studio client: {str(e)}")
+            logger.warning("Failed to initialize LM Studio client: %s", e)
             return None
             
     def _check_lm_studio_availability(self):
         """Check if LM Studio is available and running"""
+        # Probes run inside st.cache_data and on the shared service, where st.* output
+        # would be replayed on cache hits; failures are logged and kept for Test Connection
+        self.lm_studio_error = None
         if not self.lm_studio_client:
+            self.lm_studio_error = "LM Studio client could not be initialized"
             return False
         try:
             # First try to get available models to check connection
-            models_response = self.lm_studio_client.models.list()
+            models_response = self._list_lm_studio_models()
             
             # If no models are loaded, return False
             if not models_response.data:
+                self.lm_studio_error = "No models are loaded"
                 return False
                 
             # Check if our configured model is available
             available_models = [model.id for model in models_response.data]
+            self.lm_studio_models = available_models
             if self.model_name not in available_models:
                 # Try to use the first available model if configured model not found
                 if available_models:
-                    st.warning(f"Configured model '{self.model_name}' not found. Available models: {', '.join(available_models)}")
+                    logger.warning(
+                        "Configured LM Studio model '%s' not found. Available models: %s",
+                        self.model_name, ', '.join(available_models)
+                    )
                     return True
                 return False
                 
             return True
         except Exception as e:
             # Log the specific error for debugging
-            st.error(f"LM Studio connection test failed: {str(e)}")
+            logger.warning("LM Studio connection test failed: %s", e)
+            self.lm_studio_error = str(e)
             return False
         
+    def _list_lm_studio_models(self):
+        """List LM Studio models with a short timeout and no retries, for availability probes"""
+        # A probe shouldn't wait out the analysis timeout or retry when no server is running
+        return self.lm_studio_client.with_options(
+            timeout=LM_STUDIO_PROBE_TIMEOUT, max_retries=0
+        ).models.list()
+        
     def set_provider(self, provider, model_name=None, lm_studio_config=None):
         """Switch between OpenAI, Ollama, and LM Studio providers"""
         self.provider = provider
@@ -99,11 +283,53 @@ class AIAnalysisService:
         else:
             self.model_name = self._get_default_model()
             
-        if lm_studio_config:
+        # Same server settings keep the existing client and probe result
+        if lm_studio_config and lm_studio_config != self.lm_studio_config:
             self.lm_studio_config = lm_studio_config
             self.lm_studio_client = self._initialize_lm_studio_client()
             self.lm_studio_available = self._check_lm_studio_availability()
             
+    def refresh_availability(self):
+        """
+        Re-probe the Ollama and LM Studio servers using the existing clients
+        
+        The service is shared across reruns and sessions, so this is what picks
+        up a local server that was started or stopped after it was created.
+        
+        Returns:
+            dict: 'ollama' and 'lm_studio' reachability flags
+        """
+        # Probe the two local servers at once so a slow one doesn't add to the other
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="privanote-probe") as probe:
+            ollama_check = probe.submit(self._check_ollama_availability)
+            self.lm_studio_available = self._check_lm_studio_availability()
+            self.ollama_available = ollama_check.result()
+        return {'ollama': self.ollama_available, 'lm_studio': self.lm_studio_available}
+    
+    def refresh_lm_studio_availability(self):
+        """
+        Re-probe the LM Studio server using the existing client
+        
+        Returns:
+            bool: Whether LM Studio is reachable with models loaded
+        """
+        self.lm_studio_available = self._check_lm_studio_availability()
+        return self.lm_studio_available
+            
+    def warmup(self):
+        """Open the connection to the active provider (or load the local model) ahead of the first analysis call"""
+        try:
+            if self.provider == 'openai' and self.openai_client:
+                self.openai_client.models.list()
+            elif self.provider == 'ollama' and self.ollama_available:
+                # A request without a prompt only loads the model into memory
+                ollama.generate(model=self.model_name, keep_alive=OLLAMA_KEEP_ALIVE)
+            elif self.provider == 'lm_studio' and self.lm_studio_client:
+                self.lm_studio_client.models.list()
+        except Exception:
+            # Warmup is best-effort; the real call reports any errors
+            pass
+            
     def get_available_providers(self):
         """Get list of available AI providers"""
         providers = []
@@ -117,46 +343,26 @@ class AIAnalysisService:
                 'models': ['gpt-4o', 'gpt-4o-mini']
             })
             
+        # Model lists come from the last availability probe rather than a second request
         if self.ollama_available:
-            try:
-                # Get available Ollama models
-                models_response = ollama.list()
-                available_models = [model['name'] for model in models_response.get('models', [])]
-                providers.append({
-                    'name': 'Local Gemma (Ollama)',
-                    'value': 'ollama', 
-                    'description': 'Fully private local processing',
-                    'privacy': 'Data never leaves your device',
-                    'models': available_models if available_models else ['gemma3']
-                })
-            except Exception:
-                pass
+            providers.append({
+                'name': 'Local Gemma (Ollama)',
+                'value': 'ollama', 
+                'description': 'Fully private local processing',
+                'privacy': 'Data never leaves your device',
+                'models': self.ollama_models if self.ollama_models else ['gemma3']
+            })
                 
         if self.lm_studio_available:
-            try:
-                # Get available LM Studio models
-                models_response = self.lm_studio_client.models.list()
-                available_models = [model.id for model in models_response.data]
-                host = self.lm_studio_config.get('host', 'localhost')
-                port = self.lm_studio_config.get('port', 1234)
-                providers.append({
-                    'name': f'LM Studio ({host}:{port})',
-                    'value': 'lm_studio',
-                    'description': 'Local server with OpenAI-compatible API',
-                    'privacy': 'Data processed on local LM Studio server',
-                    'models': available_models if available_models else ['No models loaded']
-                })
-            except Exception as e:
-                # Still add the provider but indicate connection issues
-                host = self.lm_studio_config.get('host', 'localhost')
-                port = self.lm_studio_config.get('port', 1234)
-                providers.append({
-                    'name': f'LM Studio ({host}:{port}) - Connection Failed',
-                    'value': 'lm_studio',
-                    'description': 'Local server with OpenAI-compatible API',
-                    'privacy': 'Data processed on local LM Studio server',
-                    'models': [f'Connection error: {str(e)}']
-                })
+            host = self.lm_studio_config.get('host', 'localhost')
+            port = self.lm_studio_config.get('port', 1234)
+            providers.append({
+                'name': f'LM Studio ({host}:{port})',
+                'value': 'lm_studio',
+                'description': 'Local server with OpenAI-compatible API',
+                'privacy': 'Data processed on local LM Studio server',
+                'models': self.lm_studio_models if self.lm_studio_models else ['No models loaded']
+            })
                 
         if not providers:
             providers.append({
@@ -169,132 +375,344 @@ class AIAnalysisService:
             
         return providers
     
-    def analyze_meeting(self, transcript):
+    def analyze_meeting(self, transcript, on_progress=None):
         """
         Perform comprehensive AI analysis of meeting transcript
         
         Args:
             transcript (str): Meeting transcript text
+            on_progress (callable, optional): Called with the partial summary
+                while the response is streaming
             
         Returns:
             dict: Analysis results including summary, action items, and key decisions
         """
+        if len(transcript) > TRANSCRIPT_TOKEN_BUDGET * CHARS_PER_TOKEN and self._uses_ai():
+            return self._analyze_in_chunks(transcript, on_progress)
+        return self._analyze_single(transcript, on_progress)
+    
+    def _uses_ai(self):
+        """Whether analysis goes to an AI provider rather than the keyword fallback"""
+        return bool(
+            (self.provider == 'openai' and self.openai_client)
+            or (self.provider == 'ollama' and self.ollama_available)
+            or (self.provider == 'lm_studio' and self.lm_studio_available)
+        )
+    
+    def _analyze_single(self, transcript, on_progress=None):
+        """Analyze a transcript in one request to the active provider"""
         if self.provider == 'openai' and self.openai_client:
-            return self._analyze_with_openai(transcript)
+            return self._analyze_with_openai(transcript, on_progress)
         elif self.provider == 'ollama' and self.ollama_available:
-            return self._analyze_with_ollama(transcript)
+            return self._analyze_with_ollama(transcript, on_progress)
         elif self.provider == 'lm_studio' and self.lm_studio_available:
-            return self._analyze_with_lm_studio(transcript)
+            return self._analyze_with_lm_studio(transcript, on_progress)
         else:
             return self._fallback_analysis(transcript)
+    
+    def _analyze_in_chunks(self, transcript, on_progress=None):
+        """
+        Map-reduce analysis for transcripts too long for one prompt
+        
+        Overlapping chunks are analyzed in parallel (map), then one more request
+        consolidates their results into a single analysis (reduce).
+        
+        Args:
+            transcript (str): Meeting transcript text
+            on_progress (callable, optional): Receives the streaming summary of the reduce step
+            
+        Returns:
+            dict: Analysis results for the whole meeting
+        """
+        chunks = self._chunk_transcript(transcript)
+        with self.analysis_executor() as executor:
+            partials = list(executor.map(self._analyze_single, chunks))
+        
+        partials = [partial for partial in partials if partial.get('provider') != FALLBACK_PROVIDER]
+        if not partials:
+            return self._fallback_analysis(transcript)
+        
+        merged = self._merge_analyses(partials)
+        reduced = self._analyze_single(self._describe_partials(partials), on_progress)
+        if reduced.get('provider') == FALLBACK_PROVIDER:
+            # The reduce step failed; the concatenated chunk results are still AI output
+            return merged
+        
+        for field in ('action_items', 'key_decisions', 'topics_discussed', 'participants', 'next_steps'):
+            reduced[field] = self._dedupe(reduced.get(field, []))
+        return reduced
+    
+    def _chunk_transcript(self, transcript, chunk_tokens=MAP_CHUNK_TOKENS, overlap_tokens=MAP_CHUNK_OVERLAP_TOKENS):
+        """Split a transcript into overlapping chunks of roughly chunk_tokens, at word boundaries"""
+        size = chunk_tokens * CHARS_PER_TOKEN
+        overlap = overlap_tokens * CHARS_PER_TOKEN
+        chunks = []
+        start = 0
+        while True:
+            end = min(start + size, len(transcript))
+            if end < len(transcript):
+                space = transcript.rfind(' ', start, end)
+                if space > start:
+                    end = space
+            chunks.append(transcript[start:end].strip())
+            if end >= len(transcript):
+                return chunks
+            
+            # Step back by the overlap, then forward to the next word start
+            start = max(end - overlap, start + 1)
+            space = transcript.find(' ', start, end)
+            if space != -1:
+                start = space + 1
+    
+    def _describe_partials(self, partials):
+        """Render chunk analyses as notes for the reduce request"""
+        parts = []
+        for number, partial in enumerate(partials, 1):
+            lines = [f"PART {number} OF {len(partials)}", f"Summary: {partial.get('summary', '')}"]
+            for field, label in (
+                ('action_items', 'Action items'),
+                ('key_decisions', 'Key decisions'),
+                ('topics_discussed', 'Topics'),
+                ('participants', 'Participants'),
+                ('next_steps', 'Next steps')
+            ):
+                if partial.get(field):
+                    lines.append(f"{label}: " + "; ".join(str(item) for item in partial[field]))
+            parts.append("\n".join(lines))
+        
+        return (
+            "The meeting was too long to analyze at once. These are analyses of its consecutive, "
+            "slightly overlapping parts; combine them into one analysis of the whole meeting and "
+            "merge duplicates.\n\n" + "\n\n".join(parts)
+        )
+    
+    def _merge_analyses(self, partials):
+        """Combine chunk analyses without another request, de-duplicating list items"""
+        merged = {'summary': " ".join(partial.get('summary', '') for partial in partials).strip()}
+        for field in ('action_items', 'key_decisions', 'topics_discussed', 'participants', 'next_steps'):
+            merged[field] = self._dedupe(item for partial in partials for item in partial.get(field, []))
+        merged['ai_confidence'] = min(partial.get('ai_confidence', 0.5) for partial in partials)
+        merged['provider'] = partials[0].get('provider')
+        return merged
+    
+    def _dedupe(self, items):
+        """Drop repeated list items, ignoring case and surrounding whitespace"""
+        seen = set()
+        unique = []
+        for item in items:
+            key = str(item).strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
             
-    def _analyze_with_openai(self, transcript):
+    def analyze_many(self, transcripts, concurrency=8):
+        """
+        Analyze several transcripts, overlapping the provider round trips
+        
+        Args:
+            transcripts (list): Meeting transcript texts
+            concurrency (int): Maximum requests in flight for cloud providers
+            
+        Returns:
+            list: Analysis results in the same order as transcripts
+        """
+        if self._parallel_request_limit(concurrency) <= 1 or len(transcripts) <= 1:
+            return [self.analyze_meeting(transcript) for transcript in transcripts]
+        
+        with self.analysis_executor(concurrency) as executor:
+            return list(executor.map(self.analyze_meeting, transcripts))
+    
+    def analysis_executor(self, concurrency=8):
+        """
+        Create a thread pool sized for how many requests the active provider can serve
+        
+        Workers share the caller's script context, so failed calls reported with
+        st.error still reach the page.
+        
+        Args:
+            concurrency (int): Maximum requests in flight for cloud providers
+            
+        Returns:
+            ThreadPoolExecutor: Use as a context manager so the workers are shut down
+        """
+        return ThreadPoolExecutor(
+            max_workers=self._parallel_request_limit(concurrency),
+            thread_name_prefix="privanote-analysis",
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        )
+            
+    def _parallel_request_limit(self, concurrency):
+        """How many analysis requests the active provider can usefully serve at once"""
+        if self.provider == 'openai' and self.openai_client:
+            # Accounts with low rate limits can cap the fan-out; the SDK backs off on 429s
+            try:
+                return max(1, min(concurrency, int(os.getenv('OPENAI_MAX_CONCURRENCY', concurrency))))
+            except ValueError:
+                return concurrency
+        if self.provider == 'ollama' and self.ollama_available:
+            # Ollama queues anything beyond its parallel slots, so more threads only wait
+            try:
+                return max(1, int(os.getenv('OLLAMA_NUM_PARALLEL', '1')))
+            except ValueError:
+                return 1
+        # LM Studio serves one completion at a time, and queued requests would hit
+        # its client timeout; the keyword fallback is CPU-bound
+        return 1
+            
+    def _analyze_with_openai(self, transcript, on_progress=None):
         """Analyze using OpenAI API"""
         try:
-            analysis_result = self._generate_openai_analysis(transcript)
-            return {
-                'summary': analysis_result.get('summary', ''),
-                'action_items': analysis_result.get('action_items', []),
-                'key_decisions': analysis_result.get('key_decisions', []),
-                'topics_discussed': analysis_result.get('topics_discussed', []),
-                'participants': analysis_result.get('participants', []),
-                'next_steps': analysis_result.get('next_steps', []),
-                'ai_confidence': analysis_result.get('confidence', 0.85),
-                'provider': 'OpenAI'
-            }
+            analysis_result = self._generate_openai_analysis(transcript, on_progress)
+            if analysis_result.get('provider') == FALLBACK_PROVIDER:
+                return analysis_result
+            return self._format_analysis(analysis_result, 'OpenAI', 0.85)
         except Exception as e:
             st.error(f"OpenAI analysis failed: {str(e)}")
             return self._fallback_analysis(transcript)
             
-    def _analyze_with_ollama(self, transcript):
+    def _format_analysis(self, analysis_result, provider, default_confidence):
+        """Map a parsed provider reply to the app's analysis fields, dropping any extra keys"""
+        analysis = {field: analysis_result.get(field, empty()) for field, empty in _ANALYSIS_FIELDS}
+        analysis['ai_confidence'] = analysis_result.get('confidence', default_confidence)
+        analysis['provider'] = provider
+        return analysis
+    
+    def submit_batch(self, transcripts):
+        """
+        Queue transcripts for offline analysis with the OpenAI Batch API
+        
+        Batch jobs cost half as much and don't count against the interactive
+        rate limit, but finish within 24 hours instead of seconds. Each
+        transcript is sent as one request, so long meetings are trimmed to the
+        prompt budget rather than analyzed in chunks.
+        
+        Args:
+            transcripts (list): Meeting transcript texts
+            
+        Returns:
+            str: Batch ID to pass to poll_batch
+        """
+        if not self.openai_client:
+            raise RuntimeError("The Batch API requires an OpenAI API key")
+        
+        lines = [
+            serialization.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._openai_analysis_request(transcript)
+            })
+            for index, transcript in enumerate(transcripts)
+        ]
+        batch_file = self.openai_client.files.create(
+            file=("privanote_batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        batch = self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def poll_batch(self, batch_id):
+        """
+        Check an offline analysis batch and collect its results once it is done
+        
+        Files uploaded for a finished batch are deleted from OpenAI afterwards.
+        
+        Args:
+            batch_id (str): ID returned by submit_batch
+            
+        Returns:
+            tuple: (status, results) where status is the Batch API status and
+            results maps the position of each submitted transcript to its
+            analysis, leaving out requests that failed; results is None until
+            the batch ends
+        """
+        batch = self.openai_client.batches.retrieve(batch_id)
+        if batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            return batch.status, None
+        
+        results = {}
+        if batch.output_file_id:
+            output = self.openai_client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = serialization.loads(line)
+                response = record.get('response') or {}
+                if response.get('status_code') != 200:
+                    continue
+                try:
+                    content = response['body']['choices'][0]['message']['content']
+                    results[int(record['custom_id'])] = self._format_analysis(
+                        serialization.loads(content), 'OpenAI', 0.85
+                    )
+                except (KeyError, IndexError, ValueError):
+                    continue
+        
+        # Transcripts shouldn't stay on OpenAI longer than the job needs them
+        for file_id in (batch.input_file_id, batch.output_file_id, batch.error_file_id):
+            if file_id:
+                try:
+                    self.openai_client.files.delete(file_id)
+                except Exception:
+                    pass
+        
+        return batch.status, results
+            
+    def _analyze_with_ollama(self, transcript, on_progress=None):
         """Analyze using local Ollama/Gemma"""
         try:
-            analysis_result = self._generate_ollama_analysis(transcript)
-            return {
-                'summary': analysis_result.get('summary', ''),
-                'action_items': analysis_result.get('action_items', []),
-                'key_decisions': analysis_result.get('key_decisions', []),
-                'topics_discussed': analysis_result.get('topics_discussed', []),
-                'participants': analysis_result.get('participants', []),
-                'next_steps': analysis_result.get('next_steps', []),
-                'ai_confidence': analysis_result.get('confidence', 0.75),
-                'provider': f'Local {self.model_name}'
-            }
+            analysis_result = self._generate_ollama_analysis(transcript, on_progress)
+            if analysis_result.get('provider') == FALLBACK_PROVIDER:
+                return analysis_result
+            return self._format_analysis(analysis_result, f'Local {self.model_name}', 0.75)
         except Exception as e:
             st.error(f"Local AI analysis failed: {str(e)}")
             return self._fallback_analysis(transcript)
             
-    def _analyze_with_lm_studio(self, transcript):
+    def _analyze_with_lm_studio(self, transcript, on_progress=None):
         """Analyze using LM Studio (OpenAI-compatible API)"""
         try:
-            analysis_result = self._generate_lm_studio_analysis(transcript)
-            return {
-                'summary': analysis_result.get('summary', ''),
-                'action_items': analysis_result.get('action_items', []),
-                'key_decisions': analysis_result.get('key_decisions', []),
-                'topics_discussed': analysis_result.get('topics_discussed', []),
-                'participants': analysis_result.get('participants', []),
-                'next_steps': analysis_result.get('next_steps', []),
-                'ai_confidence': analysis_result.get('confidence', 0.8),
-                'provider': f'LM Studio ({self.model_name})'
-            }
+            analysis_result = self._generate_lm_studio_analysis(transcript, on_progress)
+            if analysis_result.get('provider') == FALLBACK_PROVIDER:
+                return analysis_result
+            return self._format_analysis(analysis_result, f'LM Studio ({self.model_name})', 0.8)
         except Exception as e:
             st.error(f"LM Studio analysis failed: {str(e)}")
             return self._fallback_analysis(transcript)
     
-    def _generate_ollama_analysis(self, transcript):
+    def _generate_ollama_analysis(self, transcript, on_progress=None):
         """Generate comprehensive meeting analysis using local Ollama/Gemma"""
         
-        system_prompt = """You are an expert meeting analyst. Analyze the provided meeting transcript and extract key information in a structured JSON format. Focus on being accurate and concise.
-
-Your analysis should include:
-1. A clear, concise summary of the meeting
-2. Specific action items with clear ownership when mentioned
-3. Key decisions that were made
-4. Main topics discussed
-5. Identified participants (if names are mentioned)
-6. Next steps or follow-up items
-
-Be precise and only include information that is clearly stated or strongly implied in the transcript. Respond only with valid JSON."""
-
-        user_prompt = f"""Please analyze this meeting transcript and provide a comprehensive analysis:
-
-TRANSCRIPT:
-{transcript}
-
-Respond with a JSON object containing:
-- summary: A concise 2-3 sentence summary of the meeting
-- action_items: Array of specific action items (what needs to be done)
-- key_decisions: Array of important decisions that were made
-- topics_discussed: Array of main topics/subjects discussed
-- participants: Array of participant names mentioned in the transcript
-- next_steps: Array of follow-up actions or next meeting items
-- confidence: A number between 0 and 1 indicating your confidence in the analysis"""
+        user_prompt = _ANALYSIS_USER_PROMPT.format(self._fit_to_budget(transcript))
 
         try:
-            response = ollama.chat(
+            request = dict(
                 model=self.model_name,
                 messages=[
-                    {'role': 'system', 'content': system_prompt},
+                    {'role': 'system', 'content': _OLLAMA_SYSTEM_PROMPT},
                     {'role': 'user', 'content': user_prompt}
                 ],
                 options={
                     'temperature': 0.3,
                     'num_predict': 1000
-                }
+                },
+                keep_alive=OLLAMA_KEEP_ALIVE
             )
-            
-            content = response['message']['content']
+            if on_progress is None:
+                content = ollama.chat(**request)['message']['content']
+            else:
+                content = self._collect_stream(
+                    (chunk['message']['content'] for chunk in ollama.chat(stream=True, **request)),
+                    on_progress
+                )
             if content:
-                # Try to extract JSON from response
-                import re
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    result = json.loads(json_str)
-                    return result
-                # If no JSON found, try parsing the whole response
-                return json.loads(content)
+                return self._parse_json_reply(content)
             return {}
             
         except json.JSONDecodeError as e:
@@ -304,55 +722,131 @@ Respond with a JSON object containing:
             st.error(f"Local AI error: {str(e)}")
             return self._fallback_analysis(transcript)
             
-    def _generate_openai_analysis(self, transcript):
-        """Generate comprehensive meeting analysis using OpenAI"""
+    def _fit_to_budget(self, transcript, budget=TRANSCRIPT_TOKEN_BUDGET):
+        """
+        Shorten an over-long transcript to roughly a token budget for the prompt
         
-        system_prompt = """You are an expert meeting analyst. Analyze the provided meeting transcript and extract key information in a structured format. Focus on being accurate and concise.
-
-Your analysis should include:
-1. A clear, concise summary of the meeting
-2. Specific action items with clear ownership when mentioned
-3. Key decisions that were made
-4. Main topics discussed
-5. Identified participants (if names are mentioned)
-6. Next steps or follow-up items
-
-Be precise and only include information that is clearly stated or strongly implied in the transcript. If something is unclear, don't make assumptions."""
-
-        user_prompt = f"""Please analyze this meeting transcript and provide a comprehensive analysis:
-
-TRANSCRIPT:
-{transcript}
-
-Respond with a JSON object containing:
-- summary: A concise 2-3 sentence summary of the meeting
-- action_items: Array of specific action items (what needs to be done)
-- key_decisions: Array of important decisions that were made
-- topics_discussed: Array of main topics/subjects discussed
-- participants: Array of participant names mentioned in the transcript
-- next_steps: Array of follow-up actions or next meeting items
-- confidence: A number between 0 and 1 indicating your confidence in the analysis"""
-
+        Keeps the first 60% and last 40% of the budget, where meetings usually set
+        the agenda and agree on decisions and next steps, and marks the cut.
+        
+        Args:
+            transcript (str): Meeting transcript
+            budget (int): Approximate number of tokens to keep
+            
+        Returns:
+            str: The transcript, or its start and end if it exceeds the budget
+        """
+        max_chars = budget * CHARS_PER_TOKEN
+        if len(transcript) <= max_chars:
+            return transcript
+        
+        # Cut at spaces so no word is split in half
+        head = transcript[:int(max_chars * 0.6)].rsplit(' ', 1)[0]
+        tail = transcript[-int(max_chars * 0.4):].split(' ', 1)[-1]
+        return f"{head}\n\n[... middle of the meeting omitted for length ...]\n\n{tail}"
+    
+    def _stream_completion(self, client, on_progress, **request):
+        """
+        Run a chat completion, streaming tokens when a progress callback is given
+        
+        Args:
+            client: OpenAI-compatible client
+            on_progress (callable or None): Receives the partial summary text
+            **request: Arguments for chat.completions.create
+            
+        Returns:
+            str: Full response content
+        """
+        if on_progress is None:
+            response = client.chat.completions.create(**request)
+            return response.choices[0].message.content
+        
+        return self._collect_stream(
+            (chunk.choices[0].delta.content
+             for chunk in client.chat.completions.create(stream=True, **request) if chunk.choices),
+            on_progress
+        )
+    
+    def _collect_stream(self, deltas, on_progress):
+        """
+        Join streamed text deltas, previewing the JSON summary as it arrives
+        
+        Deltas are buffered in a list and joined once at the end, so long
+        replies aren't copied on every token.
+        
+        Args:
+            deltas (iterable): Text pieces of the reply; empty or None pieces are skipped
+            on_progress (callable): Receives the partial summary text
+            
+        Returns:
+            str: Full response content
+        """
+        chunks = []
+        summary_done = False
+        for delta in deltas:
+            if not delta:
+                continue
+            chunks.append(delta)
+            
+            # Only rescan until the summary string closes; later keys aren't previewed
+            if not summary_done:
+                match = _PARTIAL_SUMMARY_RE.search("".join(chunks))
+                if match:
+                    summary_done = match.group(2) is not None
+                    on_progress(self._unescape_partial(match.group(1)))
+        
+        return "".join(chunks)
+    
+    def _parse_json_reply(self, content):
+        """
+        Parse the JSON object in a local model reply that may add prose or code fences
+        
+        Args:
+            content (str): Model reply
+            
+        Returns:
+            dict: Parsed analysis
+            
+        Raises:
+            json.JSONDecodeError: If no JSON object can be recovered
+        """
+        # Decode from each brace in turn; the decoder stops at the end of the object,
+        # so braces in surrounding prose don't matter and strings are handled correctly.
+        # A brace that doesn't start JSON fails within a few characters.
+        start = content.find('{')
+        while start != -1:
+            try:
+                result, _ = _JSON_DECODER.raw_decode(content, start)
+                if isinstance(result, dict):
+                    return result
+            except json.JSONDecodeError:
+                pass
+            start = content.find('{', start + 1)
+        
+        # If no JSON found, try parsing the whole response
+        return serialization.loads(content)
+    
+    def _unescape_partial(self, fragment):
+        """Decode JSON string escapes in a possibly truncated fragment"""
+        try:
+            return json.loads(f'"{fragment.rstrip(chr(92))}"')
+        except json.JSONDecodeError:
+            return fragment
+    
+    def _generate_openai_analysis(self, transcript, on_progress=None):
+        """Generate comprehensive meeting analysis using OpenAI"""
         try:
             if not self.openai_client:
                 return self._fallback_analysis(transcript)
             
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-                max_tokens=1500
+            content = self._stream_completion(
+                self.openai_client,
+                on_progress,
+                **self._openai_analysis_request(transcript)
             )
             
-            content = response.choices[0].message.content
             if content:
-                result = json.loads(content)
+                result = serialization.loads(content)
                 return result
             return {}
             
@@ -363,34 +857,27 @@ Respond with a JSON object containing:
             st.error(f"OpenAI API error: {str(e)}")
             return self._fallback_analysis(transcript)
     
-    def _generate_lm_studio_analysis(self, transcript):
+    def _openai_analysis_request(self, transcript):
+        """Build the chat completion arguments for a comprehensive OpenAI analysis"""
+        user_prompt = _ANALYSIS_USER_PROMPT.format(self._fit_to_budget(transcript))
+
+        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+        # do not change this unless explicitly requested by the user
+        return dict(
+            model=self.quality_model,
+            messages=[
+                {"role": "system", "content": _OPENAI_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=ANALYSIS_RESPONSE_FORMAT,
+            temperature=0.3,
+            max_tokens=1500
+        )
+    
+    def _generate_lm_studio_analysis(self, transcript, on_progress=None):
         """Generate comprehensive meeting analysis using LM Studio"""
         
-        system_prompt = """You are an expert meeting analyst. Analyze the provided meeting transcript and extract key information in a structured JSON format. Focus on being accurate and concise.
-
-Your analysis should include:
-1. A clear, concise summary of the meeting
-2. Specific action items with clear ownership when mentioned
-3. Key decisions that were made
-4. Main topics discussed
-5. Identified participants (if names are mentioned)
-6. Next steps or follow-up items
-
-Be precise and only include information that is clearly stated or strongly implied in the transcript. If something is unclear, don't make assumptions."""
-
-        user_prompt = f"""Please analyze this meeting transcript and provide a comprehensive analysis:
-
-TRANSCRIPT:
-{transcript}
-
-Respond with a JSON object containing:
-- summary: A concise 2-3 sentence summary of the meeting
-- action_items: Array of specific action items (what needs to be done)
-- key_decisions: Array of important decisions that were made
-- topics_discussed: Array of main topics/subjects discussed
-- participants: Array of participant names mentioned in the transcript
-- next_steps: Array of follow-up actions or next meeting items
-- confidence: A number between 0 and 1 indicating your confidence in the analysis"""
+        user_prompt = _ANALYSIS_USER_PROMPT.format(self._fit_to_budget(transcript))
 
         try:
             if not self.lm_studio_client:
@@ -411,27 +898,21 @@ Respond with a JSON object containing:
                 # If we can't get models list, try with configured model anyway
                 model_to_use = self.model_name
             
-            response = self.lm_studio_client.chat.completions.create(
+            # Streaming also keeps tokens arriving within the client's 10s read timeout
+            content = self._stream_completion(
+                self.lm_studio_client,
+                on_progress,
                 model=model_to_use,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": _LM_STUDIO_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.3,
                 max_tokens=1500
             )
             
-            content = response.choices[0].message.content
             if content:
-                # Try to extract JSON from response
-                import re
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    result = json.loads(json_str)
-                    return result
-                # If no JSON found, try parsing the whole response
-                return json.loads(content)
+                return self._parse_json_reply(content)
             return {}
             
         except json.JSONDecodeError as e:
@@ -441,13 +922,15 @@ Respond with a JSON object containing:
             st.error(f"LM Studio API error: {str(e)}")
             return self._fallback_analysis(transcript)
     
-    def generate_summary(self, transcript, max_length=200):
+    def generate_summary(self, transcript, max_length=200, on_progress=None):
         """
         Generate a focused summary of the meeting
         
         Args:
             transcript (str): Meeting transcript
             max_length (int): Maximum summary length in words
+            on_progress (callable, optional): Called with the summary so far
+                while tokens stream in
             
         Returns:
             str: Meeting summary
@@ -458,19 +941,28 @@ Respond with a JSON object containing:
         try:
             prompt = f"""Summarize this meeting transcript in {max_length} words or less. Focus on the main points, decisions, and outcomes:
 
-{transcript}"""
+{self._fit_to_budget(transcript)}"""
 
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
+            # Summaries are a short, low-temperature task; the small model is cheaper and faster
+            request = dict(
+                model=self.fast_model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=300
             )
+            if on_progress is None:
+                response = self.openai_client.chat.completions.create(**request)
+                content = response.choices[0].message.content
+                return content.strip() if content else ""
             
-            content = response.choices[0].message.content
-            return content.strip() if content else ""
+            # The reply is plain prose, so every token can be shown as it arrives
+            chunks = []
+            for chunk in self.openai_client.chat.completions.create(stream=True, **request):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    on_progress("".join(chunks))
+            return "".join(chunks).strip()
             
         except Exception as e:
             st.error(f"Summary generation failed: {str(e)}")
@@ -492,14 +984,13 @@ Respond with a JSON object containing:
         try:
             prompt = f"""Extract specific action items from this meeting transcript. Look for tasks, assignments, commitments, and follow-up items. Format as a JSON array of strings:
 
-{transcript}
+{self._fit_to_budget(transcript)}
 
 Respond with only a JSON array of action items."""
 
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
+            # Extraction is a short, low-temperature task; the small model is cheaper and faster
             response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
+                model=self.fast_model,
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"},
                 temperature=0.2,
@@ -508,7 +999,7 @@ Respond with only a JSON array of action items."""
             
             content = response.choices[0].message.content
             if content:
-                result = json.loads(content)
+                result = serialization.loads(content)
                 return result.get('action_items', [])
             return []
             
@@ -520,48 +1011,48 @@ Respond with only a JSON array of action items."""
         """Provide basic analysis when AI service is unavailable"""
         
         # Simple keyword-based analysis
-        words = transcript.lower().split()
-        word_count = len(words)
+        word_count = len(transcript.split())
         
-        # Basic summary (first and last sentences)
-        sentences = transcript.split('.')
+        # Basic summary (first and last sentences), without splitting the whole transcript
+        sentence_ends = self._sentence_ends(transcript)
         summary = f"Meeting transcript contains {word_count} words. "
-        if len(sentences) > 2:
-            summary += sentences[0].strip() + ". " + sentences[-2].strip() + "."
-        
-        # Simple action item detection
-        action_keywords = ['todo', 'action', 'task', 'will do', 'should', 'need to', 'follow up']
-        action_items = []
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in action_keywords):
-                action_items.append(sentence.strip())
-        
-        # Simple decision detection
-        decision_keywords = ['decided', 'agreed', 'conclusion', 'resolved', 'determined']
-        decisions = []
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in decision_keywords):
-                decisions.append(sentence.strip())
+        if len(sentence_ends) >= 2:
+            first = transcript[:sentence_ends[0]]
+            last = transcript[sentence_ends[-2] + 1:sentence_ends[-1]]
+            summary += first.strip() + ". " + last.strip() + "."
+        
+        # Simple action item and decision detection in one scan; only the
+        # sentences that contain a keyword are sliced out
+        hits = {'action': {}, 'decision': {}}
+        for match in _FALLBACK_KEYWORD_RE.finditer(transcript):
+            found = hits[match.lastgroup]
+            if len(found) < 5:  # Limit to 5 items
+                index = bisect_right(sentence_ends, match.start())
+                if index not in found:
+                    found[index] = self._sentence_at(transcript, sentence_ends, index)
+            elif len(hits['action']) >= 5 and len(hits['decision']) >= 5:
+                break
         
         return {
             'summary': summary,
-            'action_items': action_items[:5],  # Limit to 5 items
-            'key_decisions': decisions[:5],
+            'action_items': list(hits['action'].values()),
+            'key_decisions': list(hits['decision'].values()),
             'topics_discussed': [],
             'participants': [],
             'next_steps': [],
-            'ai_confidence': 0.3  # Low confidence for fallback
+            'ai_confidence': 0.3,  # Low confidence for fallback
+            'provider': FALLBACK_PROVIDER
         }
     
     def _simple_summary(self, transcript, max_length):
         """Generate simple summary without AI"""
-        words = transcript.split()
+        # Read one word past the limit to know whether to truncate, not the whole transcript
+        words = [match.group() for match in islice(_WORD_RE.finditer(transcript), max_length + 1)]
         if len(words) <= max_length:
             return transcript
         
         # Take first portion and try to end at sentence boundary
-        summary_words = words[:max_length]
-        summary_text = ' '.join(summary_words)
+        summary_text = ' '.join(words[:max_length])
         
         # Try to end at last complete sentence
         last_period = summary_text.rfind('.')
@@ -572,27 +1063,27 @@ Respond with only a JSON array of action items."""
     
     def _simple_action_extraction(self, transcript):
         """Extract action items using simple pattern matching"""
-        action_patterns = [
-            r"need to \w+",
-            r"will \w+",
-            r"should \w+",
-            r"action item",
-            r"follow up",
-            r"todo",
-            r"task"
-        ]
-        
-        import re
-        sentences = transcript.split('.')
-        action_items = []
-        
-        for sentence in sentences:
-            for pattern in action_patterns:
-                if re.search(pattern, sentence.lower()):
-                    action_items.append(sentence.strip())
+        # One scan of the whole transcript; only sentences with a cue are sliced out
+        sentence_ends = self._sentence_ends(transcript)
+        action_items = {}
+        for match in _ACTION_RE.finditer(transcript):
+            index = bisect_right(sentence_ends, match.start())
+            if index not in action_items:
+                action_items[index] = self._sentence_at(transcript, sentence_ends, index)
+                if len(action_items) == 10:  # Limit results
                     break
         
-        return action_items[:10]  # Limit results
+        return list(action_items.values())
+    
+    def _sentence_ends(self, transcript):
+        """Positions of sentence-ending punctuation in the transcript"""
+        return [match.start() for match in _SENTENCE_END_RE.finditer(transcript)]
+    
+    def _sentence_at(self, transcript, sentence_ends, index):
+        """Text of the index-th sentence, without its ending punctuation"""
+        start = sentence_ends[index - 1] + 1 if index else 0
+        end = sentence_ends[index] if index < len(sentence_ends) else len(transcript)
+        return transcript[start:end].strip()
     
     def is_available(self):
         """Check if AI analysis service is available"""
@@ -1,5 +1,6 @@
 import tempfile
 import os
+import threading
 import wave
 from typing import List, Dict, Optional, Any
 import streamlit as st
@@ -17,6 +18,9 @@ except (ImportError, OSError) as e:
     sd = None  # type: ignore
     np = None  # type: ignore
 
+INITIAL_BUFFER_SECONDS = 600  # Recording buffer preallocated at start; doubled when a meeting runs longer
+WAV_FLUSH_INTERVAL = 1.0  # Seconds between writes of newly recorded frames to the WAV file
+
 class AudioRecorder:
     """Handle real-time audio recording from microphone"""
     
@@ -24,9 +28,15 @@ class AudioRecorder:
         self.sample_rate = sample_rate
         self.channels = channels
         self.recording = False
-        self.audio_data = []
+        self._buffer = None
+        self._frames = 0
+        self.dropouts = 0
         self.stream = None
         self.temp_file = None
+        self._wav = None
+        self._written = 0
+        self._writer = None
+        self._writer_stop = None
         
     def get_audio_devices(self) -> List[Dict[str, Any]]:
         """Get list of available audio input devices"""
@@ -68,34 +78,49 @@ class AudioRecorder:
             return False
         
         try:
-            self.audio_data = []
+            if np is None or sd is None:
+                st.error("Audio libraries not available for audio processing")
+                return False
+            
+            # Callbacks copy straight into one contiguous buffer; np.empty only reserves
+            # the memory, so pages are touched as the recording reaches them
+            self._buffer = np.empty((self.sample_rate * INITIAL_BUFFER_SECONDS, self.channels), dtype=np.int16)
+            self._frames = 0
+            self.dropouts = 0
+            self._open_wav()
             self.recording = True
             
+            # Runs on PortAudio's realtime thread: only copy and count, never call into
+            # Streamlit there; stop_recording reports dropouts from the script thread
             def audio_callback(indata, frames, time, status):
                 if status:
-                    st.warning(f"Audio recording status: {status}")
+                    self.dropouts += 1
                 if self.recording:
-                    self.audio_data.append(indata.copy())
+                    self._append(indata)
             
-            # Start the audio stream
-            if np is None or sd is None:
-                st.error("Audio libraries not available for audio processing")
-                return False
-                
+            # Start the audio stream; PortAudio converts to saturated int16, the WAV
+            # sample format, so the buffer is half the size of float32
             self.stream = sd.InputStream(
                 device=device_id,
                 channels=self.channels,
                 samplerate=self.sample_rate,
                 callback=audio_callback,
-                dtype=np.float32
+                dtype=np.int16
             )
             
             self.stream.start()
+            
+            # Encode to the WAV file while recording, so Stop only has the last second left
+            self._writer_stop = threading.Event()
+            self._writer = threading.Thread(target=self._write_loop, name="privanote-wav-writer", daemon=True)
+            self._writer.start()
             return True
             
         except Exception as e:
             st.error(f"Error starting recording: {e}")
             self.recording = False
+            self._close_wav()
+            self.cleanup()
             return False
     
     def stop_recording(self) -> Optional[str]:
@@ -111,43 +136,96 @@ class AudioRecorder:
                 self.stream.close()
                 self.stream = None
             
-            if not self.audio_data:
-                return None
+            if self._writer:
+                self._writer_stop.set()
+                self._writer.join()
+                self._writer = None
             
-            if not AUDIO_AVAILABLE or np is None:
-                return None
-                
-            # Combine all audio chunks
-            audio_array = np.concatenate(self.audio_data, axis=0)
+            # Write the frames recorded since the last flush; closing patches the header sizes
+            self._write_pending()
+            self._close_wav()
             
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            self.temp_file = temp_file.name
-            temp_file.close()
+            if not self._frames:
+                self.cleanup()
+                return None
             
-            # Save as WAV file
-            with wave.open(self.temp_file, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)  # 16-bit
-                wf.setframerate(self.sample_rate)
-                
-                # Convert float32 to int16
-                audio_int16 = (audio_array * 32767).astype(np.int16)
-                wf.writeframes(audio_int16.tobytes())
+            if self.dropouts:
+                st.warning(f"Audio input reported {self.dropouts} dropouts; parts of the recording may be missing")
             
             return self.temp_file
             
         except Exception as e:
             st.error(f"Error stopping recording: {e}")
+            self._close_wav()
             return None
     
+    def get_audio(self, start=0):
+        """
+        Get the samples recorded so far without copying them
+        
+        Args:
+            start (int): First frame to return, e.g. the number of frames already consumed
+            
+        Returns:
+            numpy.ndarray: (frames, channels) int16 view; empty if nothing was recorded
+        """
+        # Read the frame count before the buffer: the callback swaps in a grown buffer
+        # before advancing the count, so the buffer read second always holds those frames
+        frames = self._frames
+        buffer = self._buffer
+        if buffer is None:
+            return np.empty((0, self.channels), dtype=np.int16)
+        return buffer[start:frames]
+    
     def get_recording_duration(self):
         """Get current recording duration in seconds"""
-        if not self.recording or not self.audio_data:
+        if not self.recording:
             return 0
         
-        total_frames = sum(len(chunk) for chunk in self.audio_data)
-        return total_frames / self.sample_rate
+        return self._frames / self.sample_rate
+    
+    def _append(self, indata):
+        """Copy one callback block into the recording buffer, doubling it when full"""
+        start = self._frames
+        end = start + len(indata)
+        buffer = self._buffer
+        if end > len(buffer):
+            grown = np.empty((max(end, 2 * len(buffer)), self.channels), dtype=np.int16)
+            grown[:start] = buffer[:start]
+            self._buffer = buffer = grown
+        buffer[start:end] = indata
+        self._frames = end
+    
+    def _open_wav(self):
+        """Create the temporary WAV file that recorded frames are appended to"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+        self.temp_file = temp_file.name
+        temp_file.close()
+        
+        self._wav = wave.open(self.temp_file, 'wb')
+        self._wav.setnchannels(self.channels)
+        self._wav.setsampwidth(2)  # 16-bit
+        self._wav.setframerate(self.sample_rate)
+        self._written = 0
+    
+    def _close_wav(self):
+        """Close the WAV writer, which fills in the final RIFF and data chunk sizes"""
+        if self._wav:
+            self._wav.close()
+            self._wav = None
+    
+    def _write_loop(self):
+        """Append newly recorded frames to the WAV file until recording stops"""
+        while not self._writer_stop.wait(WAV_FLUSH_INTERVAL):
+            self._write_pending()
+    
+    def _write_pending(self):
+        """Append the frames not yet written to the WAV file"""
+        audio = self.get_audio(self._written)
+        # The buffer already holds WAV samples, so the view is written without a copy;
+        # writeframesraw skips the per-call header patch and close() patches it once
+        self._wav.writeframesraw(audio)
+        self._written += len(audio)
     
     def cleanup(self):
         """Clean up temporary files"""
@@ -1,6 +1,9 @@
-import json
+import io
+import zipfile
 from datetime import datetime
 
+from utils import serialization
+
 class ExportService:
     """Handle exporting meeting data to various formats"""
     
@@ -106,10 +109,7 @@ class ExportService:
         export_data['exported_at'] = datetime.now().isoformat()
         export_data['export_format'] = 'json'
         
-        if pretty:
-            return json.dumps(export_data, indent=2, ensure_ascii=False)
-        else:
-            return json.dumps(export_data, ensure_ascii=False)
+        return serialization.dumps(export_data, pretty=pretty)
     
     def to_txt(self, meeting_data):
         """
@@ -199,6 +199,35 @@ class ExportService:
         
         return csv_content
     
+    def to_markdown_zip(self, meetings):
+        """
+        Export several meetings as Markdown files in one ZIP archive
+        
+        Args:
+            meetings (list): Meeting data dicts
+            
+        Returns:
+            bytes: ZIP archive content
+        """
+        buffer = io.BytesIO()
+        used_names = set()
+        
+        # Text compresses well even at the fastest level
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            for meeting_data in meetings:
+                content, filename, _ = self.export_meeting(meeting_data, 'markdown')
+                
+                # Meetings can share a title and date
+                stem, suffix = filename[:-3], 1
+                while filename in used_names:
+                    suffix += 1
+                    filename = f"{stem}_{suffix}.md"
+                used_names.add(filename)
+                
+                archive.writestr(filename, content)
+        
+        return buffer.getvalue()
+    
     def _format_datetime(self, datetime_str):
         """Format datetime string for display"""
         if not datetime_str:
@@ -0,0 +1,16 @@
+from openai import DefaultHttpxClient
+import streamlit as st
+
+@st.cache_resource(show_spinner=False)
+def get_http_client():
+    """
+    Get the HTTP client shared by every OpenAI-compatible client in the process
+    
+    One connection pool means OpenAI, LM Studio and Whisper server clients for
+    any provider configuration reuse kept-alive connections (and TLS sessions)
+    instead of each service opening its own.
+    
+    Returns:
+        httpx.Client: Client with the OpenAI SDK's default limits and timeouts
+    """
+    return DefaultHttpxClient()
@@ -0,0 +1,80 @@
+"""JSON helpers that use orjson when it is installed
+
+orjson is an optional speed-up and is not a declared dependency; without it
+every function falls back to the stdlib json module with the same output types.
+"""
+import json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def dumps(data, pretty=False):
+    """
+    Serialize data to a JSON string, using orjson when it is installed
+    
+    Args:
+        data: JSON-compatible data
+        pretty (bool): Whether to indent with two spaces
+    
+    Returns:
+        str: JSON formatted content
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=_orjson_option(pretty)).decode('utf-8')
+    
+    return json.dumps(data, indent=2 if pretty else None, ensure_ascii=False, default=_json_default)
+
+def dumps_bytes(data, pretty=False):
+    """
+    Serialize data to UTF-8 JSON bytes, e.g. for downloads
+    
+    With orjson this is its native output, skipping the decode that dumps() does.
+    
+    Args:
+        data: JSON-compatible data
+        pretty (bool): Whether to indent with two spaces
+    
+    Returns:
+        bytes: UTF-8 encoded JSON content
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=_orjson_option(pretty))
+    
+    return dumps(data, pretty=pretty).encode('utf-8')
+
+def _json_default(value):
+    """Convert numpy values for the stdlib fallback, matching orjson's OPT_SERIALIZE_NUMPY"""
+    # Only np.float64 subclasses float; np.float32, np.int64 and arrays need converting.
+    # tolist() returns a Python scalar for numpy scalars and nested lists for arrays
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _orjson_option(pretty):
+    """Build the orjson option flags shared by dumps() and dumps_bytes()"""
+    # Audio metadata can carry numpy scalars and arrays, which orjson needs opting into
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return option
+
+def loads(content):
+    """
+    Parse a JSON string or bytes, using orjson when it is installed
+    
+    Args:
+        content (str or bytes): JSON content
+    
+    Returns:
+        Parsed data
+    
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(content)
+    
+    return json.loads(content)
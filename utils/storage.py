@@ -1,7 +1,16 @@
 import streamlit as st
+import bisect
 import json
+import re
 from datetime import datetime
 
+from utils import serialization
+
+_TOKEN_RE = re.compile(r"\w+")
+_CORPUS_SEPARATOR = "\x00"  # Queries containing it match nothing, so hits never span meetings
+SUMMARY_SNIPPET_LENGTH = 200
+LISTING_FIELDS = ('id', 'title', 'date', 'duration', 'summary_snippet')
+
 class StorageService:
     """Handle local storage of meeting data using Streamlit session state"""
     
@@ -10,11 +19,17 @@ class StorageService:
     
     def _initialize_storage(self):
         """Initialize storage in session state"""
-        if 'meetings' not in st.session_state:
-            st.session_state.meetings = []
+        self._meetings()
         if 'storage_version' not in st.session_state:
             st.session_state.storage_version = "1.0"
     
+    def _meetings(self):
+        """Get this session's meeting list, creating it on first access"""
+        # The service is shared across sessions, so __init__ alone can't set this up
+        if 'meetings' not in st.session_state:
+            st.session_state.meetings = []
+        return st.session_state.meetings
+    
     def save_meeting(self, meeting_data):
         """
         Save meeting data to local storage
@@ -33,9 +48,15 @@ class StorageService:
             # Add metadata
             meeting_data['saved_at'] = datetime.now().isoformat()
             meeting_data['version'] = "1.0"
+            self._add_summary_snippet(meeting_data)
             
             # Add to session state
-            st.session_state.meetings.append(meeting_data)
+            meetings = self._meetings()
+            id_index = self._get_id_index()
+            self._adjust_totals(1, meeting_data.get('duration', 0), self._text_size(meeting_data))
+            meetings.append(meeting_data)
+            id_index[meeting_data.get('id')] = len(meetings) - 1
+            self._mark_changed(id_index_updated=True)
             
             return meeting_data['id']
             
@@ -52,19 +73,54 @@ class StorageService:
         Returns:
             dict or None: Meeting data or None if not found
         """
-        for meeting in st.session_state.meetings:
-            if meeting.get('id') == meeting_id:
-                return meeting
-        return None
+        position = self._get_id_index().get(meeting_id)
+        return None if position is None else self._meetings()[position]
     
-    def get_all_meetings(self):
+    def get_all_meetings(self, order=None, fields=None):
         """
         Get all stored meetings
         
+        Snapshots are cached per session and only rebuilt after a mutation,
+        so reruns that don't change storage skip the copy and the sort.
+        
+        Args:
+            order (str, optional): 'asc' or 'desc' to sort by creation time;
+                None keeps storage order
+            fields (iterable, optional): Keys to keep in each meeting, e.g. for
+                list views that don't need transcripts; None returns full meetings
+            
         Returns:
-            list: List of all meeting data
+            tuple: Snapshot of all meeting data
         """
-        return st.session_state.meetings.copy()
+        if order not in (None, 'asc', 'desc'):
+            raise ValueError(f"Invalid order: {order}")
+        
+        version = st.session_state.get('meetings_version', 0)
+        cached = st.session_state.get('meetings_snapshot')
+        if not cached or cached['version'] != version:
+            cached = {'version': version, 'orders': {None: tuple(self._meetings())}, 'projections': {}}
+            st.session_state.meetings_snapshot = cached
+        
+        orders = cached['orders']
+        if order not in orders:
+            orders[order] = tuple(sorted(
+                orders[None],
+                key=lambda m: m.get('created_at') or '',
+                reverse=(order == 'desc')
+            ))
+        
+        if fields is None:
+            return orders[order]
+        
+        projection_key = (order, frozenset(fields))
+        projections = cached['projections']
+        if projection_key not in projections:
+            projections[projection_key] = tuple(
+                {field: meeting[field] for field in fields if field in meeting}
+                for meeting in orders[order]
+            )
+        
+        return projections[projection_key]
     
     def update_meeting(self, meeting_id, updated_data):
         """
@@ -77,14 +133,26 @@ class StorageService:
         Returns:
             bool: True if updated, False if not found
         """
-        for i, meeting in enumerate(st.session_state.meetings):
-            if meeting.get('id') == meeting_id:
-                # Preserve original creation time
-                updated_data['created_at'] = meeting.get('created_at')
-                updated_data['updated_at'] = datetime.now().isoformat()
-                st.session_state.meetings[i] = updated_data
-                return True
-        return False
+        i = self._get_id_index().get(meeting_id)
+        if i is None:
+            return False
+        
+        meetings = self._meetings()
+        meeting = meetings[i]
+        # Preserve original creation time
+        updated_data['created_at'] = meeting.get('created_at')
+        updated_data['updated_at'] = datetime.now().isoformat()
+        updated_data.pop('summary_snippet', None)
+        self._add_summary_snippet(updated_data)
+        self._adjust_totals(
+            0,
+            updated_data.get('duration', 0) - meeting.get('duration', 0),
+            self._text_size(updated_data) - self._text_size(meeting)
+        )
+        meetings[i] = updated_data
+        # Positions are unchanged, so the ID index stays valid
+        self._mark_changed(id_index_updated=True)
+        return True
     
     def delete_meeting(self, meeting_id):
         """
@@ -96,20 +164,176 @@ class StorageService:
         Returns:
             bool: True if deleted, False if not found
         """
-        for i, meeting in enumerate(st.session_state.meetings):
-            if meeting.get('id') == meeting_id:
-                del st.session_state.meetings[i]
-                return True
-        return False
+        i = self._get_id_index().get(meeting_id)
+        if i is None:
+            return False
+        
+        meetings = self._meetings()
+        self._adjust_totals(-1, -meetings[i].get('duration', 0), -self._text_size(meetings[i]))
+        del meetings[i]
+        # Later meetings shift down a position; the ID index is rebuilt on next use
+        self._mark_changed()
+        return True
     
     def clear_all_meetings(self):
         """Clear all stored meetings"""
-        st.session_state.meetings = []
+        self._meetings().clear()
+        st.session_state.meetings_totals = {'count': 0, 'duration': 0, 'text': 0}
+        # Derived data would otherwise keep every transcript alive until its next rebuild
+        for key in ('meetings_snapshot', 'meetings_by_id', 'search_index', 'meetings_date_range'):
+            st.session_state.pop(key, None)
+        self._mark_changed()
+    
+    def get_totals(self):
+        """
+        Get meeting count and total audio duration without scanning meetings
+        
+        Returns:
+            dict: 'total_meetings' and 'total_duration' (minutes)
+        """
+        totals = self._totals()
+        return {
+            'total_meetings': totals['count'],
+            'total_duration': totals['duration']
+        }
+    
+    def _totals(self):
+        """Get the running totals, computing them once if this session has none yet"""
+        totals = st.session_state.get('meetings_totals')
+        if totals is None:
+            meetings = self._meetings()
+            totals = {
+                'count': len(meetings),
+                'duration': sum(meeting.get('duration', 0) for meeting in meetings),
+                'text': sum(self._text_size(meeting) for meeting in meetings)
+            }
+            st.session_state.meetings_totals = totals
+        return totals
+    
+    def _adjust_totals(self, count_delta, duration_delta, text_delta=0):
+        """Apply a mutation to the running totals; call before changing the list"""
+        totals = self._totals()
+        totals['count'] += count_delta
+        totals['duration'] += duration_delta
+        totals['text'] += text_delta
+        if totals['count'] == 0:
+            # Repeated float adds/subtracts can leave e.g. -1e-15 behind
+            totals['duration'] = 0
+    
+    def _text_size(self, meeting):
+        """Characters of transcript and analysis, the basis of the storage size estimate"""
+        return len(meeting.get('transcript', '')) + len(str(meeting.get('analysis', {})))
+    
+    def _add_summary_snippet(self, meeting):
+        """Store a pre-truncated summary so list views don't slice it on every rerun"""
+        if 'summary_snippet' in meeting:
+            return
+        summary = meeting.get('analysis', {}).get('summary', '')
+        if len(summary) > SUMMARY_SNIPPET_LENGTH:
+            summary = summary[:SUMMARY_SNIPPET_LENGTH] + "..."
+        meeting['summary_snippet'] = summary
+    
+    def _get_id_index(self):
+        """Get the meeting ID -> list position map for this session, rebuilding it when stale"""
+        version = st.session_state.get('meetings_version', 0)
+        cached = st.session_state.get('meetings_by_id')
+        if not cached or cached['version'] != version:
+            cached = {
+                'version': version,
+                'positions': {meeting.get('id'): i for i, meeting in enumerate(self._meetings())}
+            }
+            st.session_state.meetings_by_id = cached
+        return cached['positions']
+    
+    def _mark_changed(self, id_index_updated=False):
+        """Bump the storage version so derived data (search index) is rebuilt"""
+        version = st.session_state.get('meetings_version', 0) + 1
+        st.session_state.meetings_version = version
+        if id_index_updated:
+            # The caller kept the ID index current in place; no rebuild needed
+            st.session_state.meetings_by_id['version'] = version
+    
+    def _searchable_text(self, meeting):
+        """Build the lowercase text searched for a meeting"""
+        analysis = meeting.get('analysis', {})
+        return " ".join([
+            meeting.get('title', ''),
+            meeting.get('transcript', ''),
+            meeting.get('notes', ''),
+            analysis.get('summary', ''),
+            " ".join(analysis.get('action_items', [])),
+            " ".join(analysis.get('key_decisions', []))
+        ]).lower()
+    
+    def _get_search_index(self):
+        """
+        Get the inverted index for this session, rebuilding it after mutations
+        
+        Returns:
+            dict: 'tokens' maps token -> set of meeting IDs, 'texts' maps
+            meeting ID -> searchable text, 'positions' maps meeting ID ->
+            storage position
+        """
+        version = st.session_state.get('meetings_version', 0)
+        cached = st.session_state.get('search_index')
+        if cached and cached['version'] == version:
+            return cached
+        
+        # Meetings untouched since the last build keep their text and words, and the
+        # token map is patched in place, so a save only lowercases and tokenizes the
+        # new meeting instead of re-posting every word of the archive
+        previous = cached['entries'] if cached else {}
+        tokens = cached['tokens'] if cached else {}
+        entries = {}
+        texts = {}
+        positions = {}
+        for position, meeting in enumerate(self._meetings()):
+            meeting_id = meeting.get('id')
+            entry = previous.pop(meeting_id, None)
+            # update_meeting stores a new dict, so identity tells us the content is unchanged
+            if not entry or entry[0] is not meeting:
+                if entry:
+                    self._unindex_tokens(tokens, meeting_id, entry[2])
+                text = self._searchable_text(meeting)
+                entry = (meeting, text, frozenset(_TOKEN_RE.findall(text)))
+                for token in entry[2]:
+                    tokens.setdefault(token, set()).add(meeting_id)
+            entries[meeting_id] = entry
+            texts[meeting_id] = entry[1]
+            positions[meeting_id] = position
+        
+        # Whatever is left was deleted
+        for meeting_id, entry in previous.items():
+            self._unindex_tokens(tokens, meeting_id, entry[2])
+        
+        cached = {
+            'version': version,
+            'tokens': tokens,
+            'texts': texts,
+            'positions': positions,
+            'entries': entries,
+            'matches': {}
+        }
+        st.session_state.search_index = cached
+        return cached
+    
+    def _unindex_tokens(self, tokens, meeting_id, meeting_tokens):
+        """Remove a meeting from the token map, dropping words no other meeting uses"""
+        for token in meeting_tokens:
+            meeting_ids = tokens[token]
+            meeting_ids.discard(meeting_id)
+            if not meeting_ids:
+                del tokens[token]
     
     def search_meetings(self, query, fields=None):
         """
         Search meetings by text query
         
+        With the default fields the search uses a cached inverted index to
+        narrow candidates before the substring check, so results match a plain
+        substring search over title, transcript, notes, summary, action items
+        and key decisions.
+        
         Args:
             query (str): Search query
             fields (list, optional): Fields to search in
@@ -117,13 +341,88 @@ class StorageService:
         Returns:
             list: Matching meetings
         """
-        if fields is None:
-            fields = ['title', 'transcript', 'notes']
+        if fields is not None:
+            return self._scan_meetings(query, fields)
         
+        query_lower = query.lower()
+        index = self._get_search_index()
+        texts = index['texts']
+        
+        candidates = None
+        for query_token in set(_TOKEN_RE.findall(query_lower)):
+            token_hits = self._match_query_token(index, query_token)
+            candidates = token_hits if candidates is None else candidates & token_hits
+            if not candidates:
+                return []
+        
+        if candidates is None:
+            # Query has no word characters, so every meeting is a candidate
+            matching_ids = self._scan_corpus(index, query_lower)
+        else:
+            matching_ids = {meeting_id for meeting_id in candidates if query_lower in texts[meeting_id]}
+        
+        # Order hits by storage position rather than walking every meeting per keystroke
+        entries = index['entries']
+        return [entries[meeting_id][0] for meeting_id in sorted(matching_ids, key=index['positions'].get)]
+    
+    def _scan_corpus(self, index, query_lower):
+        """Find meetings containing query_lower with str.find over one joined text"""
+        if _CORPUS_SEPARATOR in query_lower:
+            return set()
+        
+        if 'corpus' not in index:
+            # Built on first use; word queries never need it
+            meeting_ids = list(index['texts'])
+            starts = []
+            offset = 0
+            for meeting_id in meeting_ids:
+                starts.append(offset)
+                offset += len(index['texts'][meeting_id]) + len(_CORPUS_SEPARATOR)
+            corpus = _CORPUS_SEPARATOR.join(index['texts'][meeting_id] for meeting_id in meeting_ids)
+            index['corpus'] = (corpus, starts, meeting_ids)
+        
+        corpus, starts, meeting_ids = index['corpus']
+        matching_ids = set()
+        position = corpus.find(query_lower)
+        while position != -1:
+            i = bisect.bisect_right(starts, position) - 1
+            matching_ids.add(meeting_ids[i])
+            if i + 1 == len(starts):
+                break
+            # One hit per meeting is enough; resume at the next meeting's text
+            position = corpus.find(query_lower, starts[i + 1])
+        return matching_ids
+    
+    def _match_query_token(self, index, query_token):
+        """Get IDs of meetings with an indexed word containing query_token"""
+        matches = index['matches']
+        if query_token in matches:
+            return matches[query_token][1]
+        
+        # A query word may be part of a longer indexed word ("meet" in "meeting").
+        # Words containing "meeti" also contain "meet", so while typing only the
+        # previous keystroke's matches need checking instead of the whole vocabulary.
+        vocabulary = index['tokens'].keys()
+        for known, (known_vocabulary, _) in matches.items():
+            if known in query_token and len(known_vocabulary) < len(vocabulary):
+                vocabulary = known_vocabulary
+        
+        matched_vocabulary = [token for token in vocabulary if query_token in token]
+        meeting_ids = set()
+        for token in matched_vocabulary:
+            meeting_ids |= index['tokens'][token]
+        
+        if len(matches) >= 256:
+            matches.clear()
+        matches[query_token] = (matched_vocabulary, meeting_ids)
+        return meeting_ids
+    
+    def _scan_meetings(self, query, fields):
+        """Linear search over a custom set of fields"""
         query_lower = query.lower()
         matching_meetings = []
         
-        for meeting in st.session_state.meetings:
+        for meeting in self._meetings():
             # Search in specified fields
             search_text = ""
             for field in fields:
@@ -149,9 +448,9 @@ class StorageService:
         Returns:
             dict: Storage statistics
         """
-        meetings = st.session_state.meetings
+        totals = self._totals()
         
-        if not meetings:
+        if not totals['count']:
             return {
                 'total_meetings': 0,
                 'total_duration': 0,
@@ -160,24 +459,27 @@ class StorageService:
                 'newest_meeting': None
             }
         
-        total_duration = sum(meeting.get('duration', 0) for meeting in meetings)
+        # Estimate storage size (rough calculation) from the running text total
+        storage_size_mb = (totals['text'] * 2) / (1024 * 1024)
         
-        # Estimate storage size (rough calculation)
-        total_text = 0
-        for meeting in meetings:
-            total_text += len(meeting.get('transcript', ''))
-            total_text += len(str(meeting.get('analysis', {})))
-        
-        storage_size_mb = (total_text * 2) / (1024 * 1024)  # Rough estimate
-        
-        # Find date range
-        dates = [meeting.get('created_at') for meeting in meetings if meeting.get('created_at')]
-        oldest = min(dates) if dates else None
-        newest = max(dates) if dates else None
+        # A delete can remove the oldest or newest meeting, so the date range is
+        # cached per storage version rather than kept as a running value
+        version = st.session_state.get('meetings_version', 0)
+        cached = st.session_state.get('meetings_date_range')
+        if not cached or cached['version'] != version:
+            dates = [meeting.get('created_at') for meeting in self._meetings() if meeting.get('created_at')]
+            cached = {
+                'version': version,
+                'oldest': min(dates) if dates else None,
+                'newest': max(dates) if dates else None
+            }
+            st.session_state.meetings_date_range = cached
+        oldest = cached['oldest']
+        newest = cached['newest']
         
         return {
-            'total_meetings': len(meetings),
-            'total_duration': total_duration,
+            'total_meetings': totals['count'],
+            'total_duration': totals['duration'],
             'storage_size_estimate': storage_size_mb,
             'oldest_meeting': oldest,
             'newest_meeting': newest
@@ -193,10 +495,10 @@ class StorageService:
         export_data = {
             'export_date': datetime.now().isoformat(),
             'version': st.session_state.get('storage_version', '1.0'),
-            'meetings': st.session_state.meetings
+            'meetings': self._meetings()
         }
         
-        return json.dumps(export_data, indent=2)
+        return serialization.dumps(export_data, pretty=True)
     
     def import_data(self, json_data):
         """
@@ -209,7 +511,7 @@ class StorageService:
             int: Number of meetings imported
         """
         try:
-            data = json.loads(json_data)
+            data = serialization.loads(json_data)
             imported_meetings = data.get('meetings', [])
             
             # Validate imported data
@@ -219,10 +521,23 @@ class StorageService:
                     valid_meetings.append(meeting)
             
             # Add to existing meetings (avoid duplicates by ID)
-            existing_ids = {m.get('id') for m in st.session_state.meetings}
-            new_meetings = [m for m in valid_meetings if m.get('id') not in existing_ids]
+            meetings = self._meetings()
+            id_index = self._get_id_index()
+            new_meetings = [m for m in valid_meetings if m.get('id') not in id_index]
             
-            st.session_state.meetings.extend(new_meetings)
+            if new_meetings:
+                # Meetings from older exports may predate the snippet field
+                for meeting in new_meetings:
+                    self._add_summary_snippet(meeting)
+                self._adjust_totals(
+                    len(new_meetings),
+                    sum(meeting.get('duration', 0) for meeting in new_meetings),
+                    sum(self._text_size(meeting) for meeting in new_meetings)
+                )
+                for meeting in new_meetings:
+                    id_index[meeting.get('id')] = len(meetings)
+                    meetings.append(meeting)
+                self._mark_changed(id_index_updated=True)
             
             return len(new_meetings)
             
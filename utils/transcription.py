@@ -1,44 +1,126 @@
-from faster_whisper import WhisperModel
+import os
+import re
+import wave
+import numpy as np
+from openai import OpenAI
 import streamlit as st
+from utils.http_client import get_http_client
+
+WHISPER_SAMPLE_RATE = 16000  # Whisper's native input rate
+BATCH_SIZE = 16  # VAD chunks decoded per forward pass
+DEFAULT_WHISPER_SERVER_MODEL = 'Systran/faster-whisper-large-v3'
+UTTERANCE_END_SILENCE_MS = 600  # Trailing silence that marks a live utterance as finished
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPACE_BEFORE_PUNCTUATION_RE = re.compile(r' ([.,?!])')
+_EMPTY_SENTENCES_RE = re.compile(r'^(?:\. )+|(?<=\. )(?:\. )+')  # ". " runs with nothing between them
+_SENTENCE_START_RE = re.compile(r'(?:^|(?<=\. ))(.)')
+
+@st.cache_resource(show_spinner=False)
+def _load_whisper_model(model_size, configurations):
+    """
+    Load a Whisper model once per process and size, trying configurations in order
+    
+    Args:
+        model_size (str): Whisper model size
+        configurations (list): Device/compute type dicts in order of preference
+        
+    Returns:
+        tuple: (WhisperModel, dict, list) warmed-up model, the configuration it loaded
+        with, and descriptions of configurations that failed before it
+    """
+    # Imported on first load so pages that never transcribe don't pay for CTranslate2
+    from faster_whisper import WhisperModel
+    
+    # No st.* calls in here: cache_resource replays them on every cache hit, in every
+    # session, so the caller reports progress and failures instead
+    failures = []
+    for config in configurations:
+        try:
+            device = config['device']
+            compute_type = config['compute_type']
+            
+            # Initialize model with current configuration
+            model = WhisperModel(
+                model_size, 
+                device=device, 
+                compute_type=compute_type,
+                cpu_threads=os.cpu_count() or 0,  # 0 lets CTranslate2 pick
+                download_root=None  # Use default cache directory
+            )
+            
+            _warmup_model(model)
+            return model, config, failures
+            
+        except Exception as e:
+            failures.append(f"{config['device']} with {config['compute_type']}: {str(e)}")
+            continue
+    
+    # Raising keeps the failure out of the cache so a later call can retry
+    raise Exception("Failed to initialize Whisper model with any configuration: " + "; ".join(failures))
+
+def _warmup_model(model):
+    """Run a short silent clip through the model so the first upload skips kernel setup"""
+    try:
+        silence = np.zeros(WHISPER_SAMPLE_RATE // 10, dtype=np.float32)
+        segments, _ = model.transcribe(silence, beam_size=1, vad_filter=False)
+        # Segments are produced lazily; consume them to actually run the decoder
+        for _ in segments:
+            pass
+    except Exception:
+        # Warmup is best-effort; real transcriptions report their own errors
+        pass
 
 class TranscriptionService:
     """Handle local audio transcription using faster-whisper"""
     
     def __init__(self):
         self.model = None
+        self.batched_model = None
+        self.load_failed = False  # Don't retry a failed load on every rerun
+        self.device_config = None  # Device/compute type the loaded model runs with
         self.model_size = "base"  # Start with base model for speed/accuracy balance
-        self._initialize_model()
+        self.sample_rate = WHISPER_SAMPLE_RATE
+    
+    def ensure_model(self):
+        """
+        Load the Whisper model if it isn't loaded yet
+        
+        The model is loaded on first use rather than at startup, so sessions
+        that only browse the archive never load it.
+        
+        Returns:
+            bool: True if the model is ready
+        """
+        if not self.model and not self.load_failed:
+            self._initialize_model()
+        return self.model is not None
     
     def _initialize_model(self):
         """Initialize the Whisper model with automatic device/compute type detection"""
-        # Try different configurations in order of preference
-        configurations = self._get_device_configurations()
+        from faster_whisper import BatchedInferencePipeline
         
-        for config in configurations:
-            try:
-                device = config['device']
-                compute_type = config['compute_type']
-                
-                st.info(f"Trying Whisper model: {self.model_size} on {device} with {compute_type}")
-                
-                # Initialize model with current configuration
-                self.model = WhisperModel(
-                    self.model_size, 
-                    device=device, 
-                    compute_type=compute_type,
-                    download_root=None  # Use default cache directory
+        # Models are cached per size, so switching back to a size reuses the loaded one
+        try:
+            with st.spinner(f"Loading Whisper {self.model_size} model..."):
+                self.model, self.device_config, failures = _load_whisper_model(
+                    self.model_size, self._get_device_configurations()
                 )
-                
-                st.success(f"Successfully initialized Whisper model on {device} with {compute_type}")
-                return
-                
-            except Exception as e:
-                st.warning(f"Failed to initialize on {config['device']} with {config['compute_type']}: {str(e)}")
-                continue
-        
-        # If all configurations failed
-        st.error("Failed to initialize Whisper model with any configuration")
-        self.model = None
+            for failure in failures:
+                st.warning(f"Failed to initialize Whisper on {failure}")
+            st.toast(
+                f"Whisper {self.model_size} model ready on {self.device_config['device']} "
+                f"with {self.device_config['compute_type']}"
+            )
+            # Batched decoding of VAD chunks; wraps the same weights, so it's cheap to build
+            self.batched_model = BatchedInferencePipeline(model=self.model)
+            self.load_failed = False
+        except Exception as e:
+            st.error(str(e))
+            self.model = None
+            self.batched_model = None
+            self.device_config = None
+            self.load_failed = True
     
     def _get_device_configurations(self):
         """Get list of device configurations to try, in order of preference"""
@@ -48,8 +130,9 @@ class TranscriptionService:
         cuda_available = self._check_cuda_availability()
         
         if cuda_available:
-            # Try CUDA with different compute types
+            # Try CUDA with different compute types (int8 weights halve memory traffic)
             configurations.extend([
+                {'device': 'cuda', 'compute_type': 'int8_float16'},
                 {'device': 'cuda', 'compute_type': 'float16'},
                 {'device': 'cuda', 'compute_type': 'int8'},
                 {'device': 'auto', 'compute_type': 'float16'},
@@ -84,74 +167,143 @@ class TranscriptionService:
             # Any other error, assume no CUDA
             return False
     
+    def load_audio(self, audio_path):
+        """
+        Decode an audio file once into Whisper-ready samples
+        
+        Args:
+            audio_path (str): Path to audio file
+            
+        Returns:
+            numpy.ndarray: Mono float32 samples at self.sample_rate
+        """
+        from faster_whisper import decode_audio
+        
+        try:
+            # Recorder output is already Whisper-ready; read it without a decode/resample pass
+            samples = self._read_pcm_wav(audio_path)
+            if samples is not None:
+                return samples
+            return decode_audio(audio_path, sampling_rate=self.sample_rate)
+        except Exception as e:
+            raise Exception(f"Could not decode audio: {str(e)}")
+    
+    def _read_pcm_wav(self, audio_path):
+        """Read a 16-bit mono WAV at self.sample_rate directly; None for anything else"""
+        if not str(audio_path).lower().endswith('.wav'):
+            return None
+        try:
+            with wave.open(audio_path, 'rb') as wf:
+                params = wf.getparams()
+                if (params.nchannels != 1 or params.sampwidth != 2
+                        or params.framerate != self.sample_rate or params.comptype != 'NONE'):
+                    return None
+                frames = wf.readframes(params.nframes)
+        except (wave.Error, EOFError):
+            # Not plain PCM (e.g. float or extensible WAV); let the decoder handle it
+            return None
+        
+        samples = np.frombuffer(frames, dtype='<i2').astype(np.float32)
+        samples /= 32768.0
+        return samples
+    
     def transcribe(self, audio_path, language=None):
         """
         Transcribe audio file to text
         
         Args:
-            audio_path (str): Path to audio file
+            audio_path (str or numpy.ndarray): Path to audio file or decoded samples
             language (str, optional): Language code for transcription
             
         Returns:
             str: Transcribed text
         """
-        if not self.model:
+        parts = [text for text, _ in self.transcribe_stream(audio_path, language)]
+        transcript_text = self.join_segments(parts)
+        
+        if not transcript_text:
+            raise Exception("Transcription failed: No speech detected in audio")
+        
+        return transcript_text
+    
+    def transcribe_stream(self, audio_path, language=None):
+        """
+        Transcribe audio file, yielding text as each segment is decoded
+        
+        Speech regions found by VAD are decoded in batches of BATCH_SIZE, and
+        segments become available while later batches are still being processed.
+        
+        Args:
+            audio_path (str or numpy.ndarray): Path to audio file or samples from load_audio
+            language (str, optional): Language code for transcription
+            
+        Yields:
+            tuple: (segment_text, progress) with progress between 0 and 1
+        """
+        if not self.ensure_model():
             raise Exception("Whisper model not initialized")
         
         try:
-            # Transcribe with faster-whisper
-            segments, info = self.model.transcribe(
+            # Transcribe with faster-whisper; chunks are independent, so no previous-text conditioning
+            segments, info = self.batched_model.transcribe(
                 audio_path,
                 language=language,
-                beam_size=5,
-                best_of=5,
+                beam_size=1,  # Greedy decoding; int8 + VAD keeps accuracy close to beam search
                 temperature=0.0,
-                condition_on_previous_text=False,
                 initial_prompt=None,
                 word_timestamps=False,
-                vad_filter=True,  # Voice activity detection
+                vad_filter=True,  # Voice activity detection splits the audio into batchable chunks
                 vad_parameters=dict(
                     min_silence_duration_ms=500,
                     speech_pad_ms=400
-                )
+                ),
+                batch_size=BATCH_SIZE
             )
             
-            # Combine all segments into full transcript
-            transcript_text = ""
+            duration = info.duration or 0
             for segment in segments:
-                transcript_text += segment.text.strip() + " "
-            
-            # Clean up the transcript
-            transcript_text = self._clean_transcript(transcript_text.strip())
-            
-            if not transcript_text:
-                raise Exception("No speech detected in audio")
-            
-            return transcript_text
-            
+                text = segment.text.strip()
+                if text:
+                    progress = min(segment.end / duration, 1.0) if duration else 0.0
+                    yield text, progress
+                    
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
     
-    def transcribe_with_timestamps(self, audio_path, language=None):
+    def join_segments(self, parts):
+        """
+        Combine streamed segment texts into a cleaned transcript
+        
+        Args:
+            parts (list): Segment texts in order
+            
+        Returns:
+            str: Cleaned transcript text
+        """
+        return self._clean_transcript(" ".join(parts))
+    
+    def transcribe_with_timestamps(self, audio_path, language=None, beam_size=1):
         """
         Transcribe audio with timestamp information
         
         Args:
             audio_path (str): Path to audio file
             language (str, optional): Language code for transcription
+            beam_size (int): Beams searched per decoding step; 1 is greedy, e.g. 5
+                for a slower high-accuracy pass
             
         Returns:
             list: List of segments with timestamps
         """
-        if not self.model:
+        if not self.ensure_model():
             raise Exception("Whisper model not initialized")
         
         try:
             segments, info = self.model.transcribe(
                 audio_path,
                 language=language,
-                beam_size=5,
-                best_of=5,
+                # best_of only applies when sampling, which temperature=0.0 never does
+                beam_size=beam_size,
                 temperature=0.0,
                 word_timestamps=True,
                 vad_filter=True
@@ -188,26 +340,14 @@ class TranscriptionService:
         text = text.strip()
         
         # Remove multiple spaces
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Fix common transcription issues
-        text = text.replace(' .', '.')
-        text = text.replace(' ,', ',')
-        text = text.replace(' ?', '?')
-        text = text.replace(' !', '!')
-        
-        # Ensure sentences start with capital letters
-        sentences = text.split('. ')
-        cleaned_sentences = []
-        for sentence in sentences:
-            if sentence:
-                sentence = sentence.strip()
-                if sentence:
-                    sentence = sentence[0].upper() + sentence[1:] if len(sentence) > 1 else sentence.upper()
-                    cleaned_sentences.append(sentence)
-        
-        text = '. '.join(cleaned_sentences)
+        text = _WHITESPACE_RE.sub(' ', text)
+        
+        # Fix common transcription issues (" ." / " ," / " ?" / " !") in one pass
+        text = _SPACE_BEFORE_PUNCTUATION_RE.sub(r'\1', text)
+        
+        # Ensure sentences start with capital letters, without splitting the text apart
+        text = _EMPTY_SENTENCES_RE.sub('', text)
+        text = _SENTENCE_START_RE.sub(lambda match: match.group(1).upper(), text)
         
         # Ensure text ends with punctuation
         if text and text[-1] not in '.!?':
@@ -235,12 +375,241 @@ class TranscriptionService:
         
         if size != self.model_size:
             self.model_size = size
-            self._initialize_model()
+            self.load_failed = False
+            # Reload now only if a model was in use; otherwise the next transcription loads it
+            if self.model:
+                self._initialize_model()
+    
+    def create_live_transcriber(self, language=None):
+        """
+        Create a LiveTranscriber on the loaded model for an in-progress recording
+        
+        Args:
+            language (str, optional): Language code for transcription
+            
+        Returns:
+            LiveTranscriber or None: None if the model could not be loaded
+        """
+        if not self.ensure_model():
+            return None
+        return LiveTranscriber(self.model, language=language, sample_rate=self.sample_rate)
     
     def get_model_info(self):
         """Get current model information"""
         return {
             'size': self.model_size,
             'initialized': self.model is not None,
+            'device': self.device_config['device'] if self.device_config else None,
+            'compute_type': self.device_config['compute_type'] if self.device_config else None,
             'supported_languages': self.get_supported_languages()
         }
+
+class LiveTranscriber:
+    """Transcribe audio while it is being recorded, committing words with LocalAgreement-2
+    
+    Each pass re-transcribes a rolling buffer of uncommitted audio. A word is
+    committed once two consecutive passes agree on it, and the buffer is then
+    trimmed past committed words, so each pass costs at most ~max_buffer_seconds
+    of audio regardless of meeting length. Silero VAD short-cuts this: an
+    utterance followed by silence is committed in one pass and dropped from
+    the buffer, and a buffer with no speech skips Whisper entirely. Never
+    calls st.*, so it can run on a worker thread.
+    """
+    
+    def __init__(self, model, language=None, sample_rate=WHISPER_SAMPLE_RATE, max_buffer_seconds=20):
+        self.model = model
+        self.language = language
+        self.sample_rate = sample_rate
+        self.max_buffer_seconds = max_buffer_seconds
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0  # Seconds of audio trimmed off the front of the buffer
+        self.committed = []  # (start, end, word) with absolute times
+        self.hypothesis = []  # Uncommitted words from the previous pass
+        self.committed_text = ""
+    
+    def insert_audio(self, chunks):
+        """
+        Append recorded audio to the active buffer
+        
+        Args:
+            chunks (list): Mono sample arrays at self.sample_rate, e.g. (frames, 1) blocks;
+                float samples in [-1, 1] or int16 as recorded
+            
+        Returns:
+            float: Seconds of audio added
+        """
+        samples = [self._to_float32(chunk) for chunk in chunks]
+        # One concatenate per batch of chunks rather than one per chunk
+        self.buffer = np.concatenate([self.buffer] + samples)
+        return sum(len(chunk) for chunk in samples) / self.sample_rate
+    
+    def _to_float32(self, chunk):
+        """Flatten a chunk to float32 samples, scaling int16 PCM into [-1, 1]"""
+        chunk = np.asarray(chunk).reshape(-1)
+        if chunk.dtype == np.int16:
+            return np.divide(chunk, 32768.0, dtype=np.float32)
+        return chunk.astype(np.float32, copy=False)
+    
+    def process(self):
+        """
+        Re-transcribe the active buffer and commit words both passes agree on
+        
+        Returns:
+            str: Committed transcript so far
+        """
+        if not len(self.buffer):
+            return self.committed_text
+        
+        speech = self._detect_speech()
+        if not speech:
+            # Nothing said since the last commit; keep a short tail in case speech is starting
+            self.hypothesis = []
+            self._trim_to(self.buffer_offset + len(self.buffer) / self.sample_rate - 1.0)
+            return self.committed_text
+        
+        speech_end = speech[-1]['end']
+        if speech_end < len(self.buffer):
+            # The last speech range closed, so the speaker paused: the utterance is complete.
+            # Commit it without waiting for a second pass and start the next one afresh
+            self._commit(self._transcribe_buffer(self.buffer[:speech_end]))
+            self.hypothesis = []
+            self._trim_to(self.buffer_offset + speech_end / self.sample_rate)
+            return self.committed_text
+        
+        words = self._transcribe_buffer(self.buffer)
+        
+        # LocalAgreement-2: commit the longest prefix shared with the previous pass
+        agreed = 0
+        while (agreed < len(words) and agreed < len(self.hypothesis)
+               and self._normalize(words[agreed][2]) == self._normalize(self.hypothesis[agreed][2])):
+            agreed += 1
+        self._commit(words[:agreed])
+        self.hypothesis = words[agreed:]
+        
+        buffer_seconds = len(self.buffer) / self.sample_rate
+        if buffer_seconds > self.max_buffer_seconds * 1.5 and self.hypothesis:
+            # Passes keep disagreeing; accept the latest pass rather than grow the window
+            self._commit(self.hypothesis)
+            self.hypothesis = []
+        if buffer_seconds > self.max_buffer_seconds and self.committed:
+            self._trim_to(self.committed[-1][1])
+        
+        return self.committed_text
+    
+    def finish(self):
+        """
+        Commit whatever the last pass produced once recording has stopped
+        
+        Returns:
+            str: Full transcript text
+        """
+        self.process()
+        self._commit(self.hypothesis)
+        self.hypothesis = []
+        return self.committed_text
+    
+    def _detect_speech(self):
+        """Find speech in the buffer with faster-whisper's Silero VAD, as sample ranges"""
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+        
+        # A range still open at the buffer end runs to len(buffer); one closes only after
+        # UTTERANCE_END_SILENCE_MS of silence
+        return get_speech_timestamps(
+            self.buffer,
+            VadOptions(min_silence_duration_ms=UTTERANCE_END_SILENCE_MS, speech_pad_ms=200),
+            sampling_rate=self.sample_rate
+        )
+    
+    def _transcribe_buffer(self, audio):
+        """Transcribe buffered audio into (start, end, word) tuples not yet committed"""
+        last_committed_end = self.committed[-1][1] if self.committed else 0.0
+        # Committed text that has left the buffer keeps Whisper's context across trims
+        prompt = self.committed_text[-200:] or None
+        
+        segments, _ = self.model.transcribe(
+            audio,
+            language=self.language,
+            beam_size=1,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            initial_prompt=prompt,
+            word_timestamps=True,
+            vad_filter=True  # Keeps Whisper from hallucinating words into pauses
+        )
+        words = [
+            (self.buffer_offset + word.start, self.buffer_offset + word.end, word.word)
+            for segment in segments
+            for word in (segment.words or [])
+        ]
+        # Words ending before the last commit were already committed by an earlier pass
+        return [w for w in words if w[0] > last_committed_end - 0.1]
+    
+    def _commit(self, words):
+        """Move words into the committed transcript"""
+        if not words:
+            return
+        self.committed.extend(words)
+        self.committed_text = (self.committed_text + "".join(w[2] for w in words)).strip()
+    
+    def _trim_to(self, seconds):
+        """Drop buffered audio before an absolute time"""
+        cut = int((seconds - self.buffer_offset) * self.sample_rate)
+        if cut > 0:
+            self.buffer = self.buffer[cut:]
+            self.buffer_offset += cut / self.sample_rate
+    
+    def _normalize(self, word):
+        """Compare words without spacing or case differences between passes"""
+        return word.strip().lower()
+
+class RemoteTranscriptionService:
+    """Offload transcription to a self-hosted, OpenAI-compatible Whisper server
+    
+    Meant for a GPU machine on the local network (e.g. faster-whisper-server),
+    so CPU-only hosts can skip local decoding while audio stays off the cloud.
+    """
+    
+    def __init__(self, server_config):
+        self.server_config = server_config
+        host = server_config.get('host', 'localhost')
+        port = server_config.get('port', 8000)
+        # Local servers ignore the API key, but the client requires one
+        self.client = OpenAI(
+            api_key="whisper-server",
+            base_url=f"http://{host}:{port}/v1",
+            timeout=600.0,
+            http_client=get_http_client()
+        )
+    
+    def transcribe(self, audio_path, language=None):
+        """
+        Transcribe an audio file on the remote server
+        
+        Blocking and free of st.* calls, so it can run on a worker thread
+        while the script thread reports progress.
+        
+        Args:
+            audio_path (str): Path to audio file
+            language (str, optional): Language code for transcription
+            
+        Returns:
+            str: Raw transcript text
+        """
+        request = {'model': self.server_config.get('model', DEFAULT_WHISPER_SERVER_MODEL)}
+        if language:
+            request['language'] = language
+        
+        try:
+            with open(audio_path, 'rb') as audio_file:
+                result = self.client.audio.transcriptions.create(file=audio_file, **request)
+            return result.text
+        except Exception as e:
+            raise Exception(f"Remote transcription failed: {str(e)}")
+    
+    def check_connection(self):
+        """Check that the server answers; returns True if reachable"""
+        try:
+            self.client.models.list()
+            return True
+        except Exception:
+            return False